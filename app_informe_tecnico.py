@@ -1,12 +1,39 @@
 import streamlit as st
-from docx import Document
-from docx.shared import Inches, Pt, RGBColor
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx.oxml.ns import qn
-from docx.oxml import OxmlElement
-from PIL import Image
+import hmac
 import io
+import os
+import tempfile
+import time
+import zipfile
 from datetime import datetime
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from streamlit.runtime.uploaded_file_manager import UploadedFile
+
+from generador_informe import (
+    crear_documento_tecnico,
+    guardar_borrador,
+    guardar_documento_consolidado,
+    leer_borrador,
+    optimizar_imagen,
+)
+from sesiones import (
+    DIR_SESIONES,
+    MINUTOS_SESION_INACTIVA,
+    SESION_ERROR_RESTAURANDO,
+    SESION_RENOVAR_SUBIDAS,
+    crear_registro,
+    expulsar_sesiones_inactivas,
+    liberar_subidas,
+    registrar_sesion,
+)
+
+# Widgets de subida de archivos. Su clave lleva `ronda_subidas`, que se
+# incrementa para descartar los archivos ya procesados o liberados.
+WIDGETS_SUBIDA = ("img_obs", "imgs_antes", "imgs_despues", "borradores")
+
+# Clave de la pestaña de recursos; si no está definida la pestaña no se muestra
+CLAVE_ADMIN = os.environ.get("INFORME_CLAVE_ADMIN", "")
+
 
 # Configuración de la página
 st.set_page_config(
@@ -17,386 +44,29 @@ st.set_page_config(
 st.title("📄 Generador de Informes Técnicos - Rotomaquinas SAS")
 st.markdown("---")
 
-
-# Función para establecer bordes de celda
-def set_cell_border(cell, **kwargs):
-    """
-    Establecer bordes de celda en la tabla.
-    """
-    tc = cell._tc
-    tcPr = tc.get_or_add_tcPr()
-
-    # Lista de bordes
-    for edge in ("top", "left", "bottom", "right"):
-        edge_data = kwargs.get(edge)
-        if edge_data:
-            tag = "w:{}".format(edge)
-            element = OxmlElement(tag)
-            for key in edge_data:
-                element.set(qn("w:{}".format(key)), str(edge_data[key]))
-            tcPr.append(element)
-
-
-# Función para agregar imagen centrada en celda
-def add_image_to_cell(cell, image_bytes, width_inches=2.5):
+# Registro compartido por todas las sesiones del servidor
+@st.cache_resource
+def obtener_registro_sesiones():
     """
-    Agregar imagen centrada en una celda.
+    Devolver el registro de sesiones (ver `sesiones.py`).
     """
-    paragraph = cell.paragraphs[0]
-    paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    run = paragraph.add_run()
-    run.add_picture(io.BytesIO(image_bytes), width=Inches(width_inches))
+    return crear_registro()
 
 
-import streamlit as st
-
-
-# Función principal para crear el documento
-def crear_documento_tecnico(datos_empresa, datos_cliente, actividades):
+# Función para obtener la clave actual de un widget de subida
+def clave_subida(nombre):
     """
-    Crear el documento técnico completo.
+    Clave del widget de subida `nombre` en la ronda actual.
     """
-    doc = Document()
-
-    # Estilos Globales
-    style = doc.styles["Normal"]
-    font = style.font
-    font.name = "Arial"
-    font.size = Pt(10)
-
-    # Configurar márgenes (2.54 cm ~ 1 pulgada)
-    sections = doc.sections
-    for section in sections:
-        section.top_margin = Inches(1)
-        section.bottom_margin = Inches(1)
-        section.left_margin = Inches(1)
-        section.right_margin = Inches(1)
-
-        # ============= ENCABEZADO (MEMBRETE) =============
-        header = section.header
-        header_table = header.add_table(rows=1, cols=2, width=Inches(6.5))
-        header_table.autofit = False
-
-        # Celda Logo (Izquierda)
-        cell_logo = header_table.cell(0, 0)
-        cell_logo.width = Inches(2.0)
-        try:
-            # Ruta relativa o absoluta al logo
-            logo_path = "assets/logo.png"
-            # Verificar si existe, si no, intentar ruta absoluta construida o manejar error
-            paragraph = cell_logo.paragraphs[0]
-            paragraph.alignment = WD_ALIGN_PARAGRAPH.LEFT
-            run = paragraph.add_run()
-            run.add_picture(logo_path, width=Inches(1.3))
-        except Exception as e:
-            cell_logo.text = "[LOGO]"
-            print(f"Error cargando logo: {e}")
-
-        # Celda Información Empresa (Derecha)
-        cell_info = header_table.cell(0, 1)
-        cell_info.width = Inches(4.5)
-        paragraph = cell_info.paragraphs[0]
-        paragraph.alignment = WD_ALIGN_PARAGRAPH.RIGHT
-
-        run = paragraph.add_run("ROTOMAQUINAS S.A.S\n")
-        run.font.bold = True
-        run.font.size = Pt(14)
-        run.font.color.rgb = RGBColor(0, 51, 102)  # Azul oscuro corporativo
-
-        run = paragraph.add_run("Servicios Operativos con Máquinas y Personal\n")
-        run.font.size = Pt(9)
-        run.font.bold = True
-
-        run = paragraph.add_run("Palmira - Valle del Cauca\n")
-        run.font.size = Pt(9)
-
-        run = paragraph.add_run(f"Fecha: {datetime.now().strftime('%d/%m/%Y')}")
-        run.font.size = Pt(8)
-        run.font.italic = True
-
-    # ============= TÍTULO DEL REPORTE =============
-    p_title = doc.add_paragraph()
-    p_title.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    run = p_title.add_run(
-        f"INFORME TÉCNICO: {datos_empresa['nombre_proyecto'].upper()}"
-    )
-    run.font.bold = True
-    run.font.size = Pt(14)
-    run.font.color.rgb = RGBColor(0, 51, 102)  # Azul oscuro
-
-    # Espacio
-    doc.add_paragraph()
-
-    # ============= TABLA DE DATOS GENERALES (Rediseñada) =============
-    # Usaremos una tabla con bordes más sutiles o solo internos
-    table = doc.add_table(rows=4, cols=2)
-    table.style = "Table Grid"  # Mantenemos grid pero podríamos personalizar
-
-    # Datos a llenar
-    data_rows = [
-        ("Fecha del Servicio:", datos_empresa["fecha"]),
-        ("Técnico Responsable:", datos_empresa["tecnico"]),
-        ("Ubicación:", datos_empresa["ubicacion"]),
-        ("Asunto:", "Servicio de mantenimiento y limpieza"),
-    ]
-
-    for i, (label, value) in enumerate(data_rows):
-        row = table.rows[i]
-
-        # Etiqueta
-        cell_label = row.cells[0]
-        cell_label.width = Inches(2.5)
-        p = cell_label.paragraphs[0]
-        run = p.add_run(label)
-        run.font.bold = True
-        run.font.size = Pt(10)
-        # Sombreado gris suave
-        shading_elm = OxmlElement("w:shd")
-        shading_elm.set(qn("w:fill"), "F2F2F2")
-        cell_label._element.get_or_add_tcPr().append(shading_elm)
-
-        # Valor
-        cell_value = row.cells[1]
-        cell_value.text = value
-        cell_value.paragraphs[0].runs[0].font.size = Pt(10)
-
-    doc.add_paragraph()
-
-    # ============= DATOS DEL CLIENTE =============
-    p = doc.add_paragraph()
-    run = p.add_run("DATOS DEL CLIENTE")
-    run.font.bold = True
-    run.font.size = Pt(11)
-    run.font.color.rgb = RGBColor(0, 51, 102)
-
-    tabla_cliente = doc.add_table(rows=3, cols=2)
-    tabla_cliente.style = "Table Grid"
-
-    client_data = [
-        ("Razon Social / Nombre:", datos_cliente["nombre"]),
-        ("NIT / C.C:", datos_cliente["nit"]),
-        ("Dirección:", datos_cliente["direccion"]),
-    ]
-
-    for i, (label, value) in enumerate(client_data):
-        row = tabla_cliente.rows[i]
-
-        cell_label = row.cells[0]
-        cell_label.width = Inches(2.5)
-        p = cell_label.paragraphs[0]
-        run = p.add_run(label)
-        run.font.bold = True
-        run.font.size = Pt(10)
-        # Sombreado gris suave
-        shading_elm = OxmlElement("w:shd")
-        shading_elm.set(qn("w:fill"), "F2F2F2")
-        cell_label._element.get_or_add_tcPr().append(shading_elm)
-
-        cell_value = row.cells[1]
-        cell_value.text = value
-        cell_value.paragraphs[0].runs[0].font.size = Pt(10)
-
-    doc.add_paragraph()
-
-    # ============= OBJETIVO =============
-    p = doc.add_paragraph()
-    run = p.add_run("OBJETIVO")
-    run.font.bold = True
-    run.font.size = Pt(11)
-
-    p = doc.add_paragraph(datos_empresa["objetivo"])
-
-    doc.add_paragraph()
-
-    # ============= NOTA =============
-    p = doc.add_paragraph()
-    run = p.add_run("NOTA:  ")
-    run.font.bold = True
-    run = p.add_run(datos_empresa["nota"])
-
-    doc.add_paragraph()
-
-    # ============= REGISTRO FOTOGRÁFICO =============
-    p = doc.add_paragraph()
-    run = p.add_run("REGISTRO FOTOGRÁFICO")
-    run.font.bold = True
-    run.font.size = Pt(12)
-    p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-
-    doc.add_paragraph()
-
-    # ============= ACTIVIDADES =============
-    for actividad in actividades:
-        # Título de la actividad
-        p = doc.add_paragraph()
-        run = p.add_run(actividad["titulo"].upper())
-        run.font.bold = True
-        run.font.size = Pt(11)
-        p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-
-        doc.add_paragraph()
-
-        # Si solo hay observación (sin ANTES/DESPUÉS)
-        if actividad["tipo"] == "solo_observacion":
-            # Tabla de observación
-            tabla_obs = doc.add_table(rows=2, cols=1)
-            tabla_obs.style = "Table Grid"
-
-            # Fila 1: OBSERVACIÓN
-            cell = tabla_obs.rows[0].cells[0]
-            p_cell = cell.paragraphs[0]
-            run = p_cell.add_run("OBSERVACIÓN: ")
-            run.font.bold = True
-            p_cell.add_run(actividad["observacion"])
-
-            # Aplicar bordes
-            set_cell_border(
-                cell,
-                top={"sz": 12, "val": "single", "color": "000000"},
-                bottom={"sz": 12, "val": "single", "color": "000000"},
-                left={"sz": 12, "val": "single", "color": "000000"},
-                right={"sz": 12, "val": "single", "color": "000000"},
-            )
-
-            # Fila 2: Imágenes
-            cell_img = tabla_obs.rows[1].cells[0]
-            if actividad.get("imagenes"):
-                # Crear una tabla interna para organizar las imágenes
-                num_imagenes = len(actividad["imagenes"])
-                cols = min(num_imagenes, 2)  # Máximo 2 columnas
-                rows = (num_imagenes + cols - 1) // cols
-
-                for idx, img_bytes in enumerate(actividad["imagenes"]):
-                    if idx > 0 and idx % cols == 0:
-                        cell_img.add_paragraph()
-                    add_image_to_cell(cell_img, img_bytes, width_inches=2.2)
-
-            # Aplicar bordes
-            set_cell_border(
-                cell_img,
-                top={"sz": 12, "val": "single", "color": "000000"},
-                bottom={"sz": 12, "val": "single", "color": "000000"},
-                left={"sz": 12, "val": "single", "color": "000000"},
-                right={"sz": 12, "val": "single", "color": "000000"},
-            )
-
-        # Si hay ANTES/DESPUÉS
-        elif actividad["tipo"] == "antes_despues":
-            # ANTES
-            if actividad.get("antes"):
-                tabla_antes = doc.add_table(rows=3, cols=1)
-                tabla_antes.style = "Table Grid"
-
-                # Fila 1: Título ANTES
-                cell = tabla_antes.rows[0].cells[0]
-                p_cell = cell.paragraphs[0]
-                run = p_cell.add_run("ANTES")
-                run.font.bold = True
-                run.font.size = Pt(11)
-                p_cell.alignment = WD_ALIGN_PARAGRAPH.CENTER
-
-                # Color de fondo
-                shading_elm = OxmlElement("w:shd")
-                shading_elm.set(qn("w:fill"), "D9D9D9")
-                cell._element.get_or_add_tcPr().append(shading_elm)
-
-                set_cell_border(
-                    cell,
-                    top={"sz": 12, "val": "single", "color": "000000"},
-                    bottom={"sz": 12, "val": "single", "color": "000000"},
-                    left={"sz": 12, "val": "single", "color": "000000"},
-                    right={"sz": 12, "val": "single", "color": "000000"},
-                )
-
-                # Fila 2: Observación ANTES
-                cell = tabla_antes.rows[1].cells[0]
-                p_cell = cell.paragraphs[0]
-                run = p_cell.add_run("OBSERVACIÓN: ")
-                run.font.bold = True
-                p_cell.add_run(actividad["antes"]["observacion"])
-
-                set_cell_border(
-                    cell,
-                    top={"sz": 12, "val": "single", "color": "000000"},
-                    bottom={"sz": 12, "val": "single", "color": "000000"},
-                    left={"sz": 12, "val": "single", "color": "000000"},
-                    right={"sz": 12, "val": "single", "color": "000000"},
-                )
+    return f"{nombre}_{st.session_state.ronda_subidas}"
 
-                # Fila 3: Imágenes ANTES
-                cell_img = tabla_antes.rows[2].cells[0]
-                if actividad["antes"].get("imagenes"):
-                    for img_bytes in actividad["antes"]["imagenes"]:
-                        add_image_to_cell(cell_img, img_bytes, width_inches=2.2)
-
-                set_cell_border(
-                    cell_img,
-                    top={"sz": 12, "val": "single", "color": "000000"},
-                    bottom={"sz": 12, "val": "single", "color": "000000"},
-                    left={"sz": 12, "val": "single", "color": "000000"},
-                    right={"sz": 12, "val": "single", "color": "000000"},
-                )
-
-                doc.add_paragraph()
-
-            # DESPUÉS
-            if actividad.get("despues"):
-                tabla_despues = doc.add_table(rows=3, cols=1)
-                tabla_despues.style = "Table Grid"
-
-                # Fila 1: Título DESPUÉS
-                cell = tabla_despues.rows[0].cells[0]
-                p_cell = cell.paragraphs[0]
-                run = p_cell.add_run("DESPUÉS")
-                run.font.bold = True
-                run.font.size = Pt(11)
-                p_cell.alignment = WD_ALIGN_PARAGRAPH.CENTER
-
-                # Color de fondo
-                shading_elm = OxmlElement("w:shd")
-                shading_elm.set(qn("w:fill"), "D9D9D9")
-                cell._element.get_or_add_tcPr().append(shading_elm)
-
-                set_cell_border(
-                    cell,
-                    top={"sz": 12, "val": "single", "color": "000000"},
-                    bottom={"sz": 12, "val": "single", "color": "000000"},
-                    left={"sz": 12, "val": "single", "color": "000000"},
-                    right={"sz": 12, "val": "single", "color": "000000"},
-                )
-
-                # Fila 2: Observación DESPUÉS
-                cell = tabla_despues.rows[1].cells[0]
-                p_cell = cell.paragraphs[0]
-                run = p_cell.add_run("OBSERVACIÓN: ")
-                run.font.bold = True
-                p_cell.add_run(actividad["despues"]["observacion"])
-
-                set_cell_border(
-                    cell,
-                    top={"sz": 12, "val": "single", "color": "000000"},
-                    bottom={"sz": 12, "val": "single", "color": "000000"},
-                    left={"sz": 12, "val": "single", "color": "000000"},
-                    right={"sz": 12, "val": "single", "color": "000000"},
-                )
 
-                # Fila 3: Imágenes DESPUÉS
-                cell_img = tabla_despues.rows[2].cells[0]
-                if actividad["despues"].get("imagenes"):
-                    for img_bytes in actividad["despues"]["imagenes"]:
-                        add_image_to_cell(cell_img, img_bytes, width_inches=2.2)
-
-                set_cell_border(
-                    cell_img,
-                    top={"sz": 12, "val": "single", "color": "000000"},
-                    bottom={"sz": 12, "val": "single", "color": "000000"},
-                    left={"sz": 12, "val": "single", "color": "000000"},
-                    right={"sz": 12, "val": "single", "color": "000000"},
-                )
-
-        doc.add_paragraph()
-
-    return doc
+# Función para filtrar los archivos subidos que siguen disponibles
+def archivos_subidos(archivos):
+    """
+    Devolver solo los archivos que siguen en el servidor (no liberados).
+    """
+    return [archivo for archivo in archivos or [] if isinstance(archivo, UploadedFile)]
 
 
 # ============= INTERFAZ DE STREAMLIT =============
@@ -432,18 +102,50 @@ with st.sidebar:
         height=100,
     )
 
+# Inicializar session_state para actividades
+if "actividades" not in st.session_state:
+    st.session_state.actividades = []
+if "ronda_subidas" not in st.session_state:
+    st.session_state.ronda_subidas = 0
+
+# Contabilizar la sesión actual y liberar las inactivas
+registro_sesiones = obtener_registro_sesiones()
+ctx = get_script_run_ctx()
+sesion_actual = ctx.session_id if ctx is not None else None
+if sesion_actual is not None:
+    bytes_subidas = sum(
+        archivo.size
+        for nombre in WIDGETS_SUBIDA
+        for archivo in archivos_subidos(st.session_state.get(clave_subida(nombre)))
+    )
+    estado_sesion = registrar_sesion(
+        registro_sesiones, sesion_actual, st.session_state.actividades, bytes_subidas
+    )
+    if estado_sesion == SESION_RENOVAR_SUBIDAS:
+        # Sus archivos subidos se liberaron y no hay subidas nuevas: quitar de
+        # los widgets los archivos que ya no existen
+        st.session_state.ronda_subidas += 1
+    elif estado_sesion == SESION_ERROR_RESTAURANDO:
+        st.error(
+            "⚠️ No se pudieron recuperar las actividades guardadas de esta sesión. "
+            "Siguen en el servidor y se volverá a intentar al recargar la página."
+        )
+expulsar_sesiones_inactivas(registro_sesiones, sesion_actual=sesion_actual)
+
 # Área principal
-tab1, tab2, tab3 = st.tabs(
-    ["📝 Agregar Actividades", "👁️ Vista Previa", "💾 Generar Documento"]
-)
+pestanas = [
+    "📝 Agregar Actividades",
+    "👁️ Vista Previa",
+    "💾 Generar Documento",
+    "📚 Consolidado Mensual",
+]
+if CLAVE_ADMIN:
+    pestanas.append("📊 Recursos")
+tab1, tab2, tab3, tab4, *tab_admin = st.tabs(pestanas)
 
 with tab1:
     st.header("Agregar Actividades al Informe")
 
-    # Inicializar session_state para actividades
-    if "actividades" not in st.session_state:
-        st.session_state.actividades = []
-
     # Selector de tipo de actividad
     col1, col2 = st.columns([2, 1])
 
@@ -489,16 +191,15 @@ with tab1:
             "Subir Fotografías",
             type=["png", "jpg", "jpeg"],
             accept_multiple_files=True,
-            key="img_obs",
+            key=clave_subida("img_obs"),
         )
 
         if st.button("➕ Agregar Actividad", type="primary", use_container_width=True):
             if titulo_actividad and observacion:
                 # Procesar imágenes
                 imgs_bytes = []
-                if imagenes:
-                    for img in imagenes:
-                        imgs_bytes.append(img.read())
+                for img in archivos_subidos(imagenes):
+                    imgs_bytes.append(optimizar_imagen(img.read()))
 
                 actividad = {
                     "titulo": titulo_actividad,
@@ -507,6 +208,11 @@ with tab1:
                     "imagenes": imgs_bytes,
                 }
                 st.session_state.actividades.append(actividad)
+
+                # Liberar las subidas originales y vaciar los widgets
+                if sesion_actual is not None:
+                    liberar_subidas(sesion_actual, archivos_subidos(imagenes))
+                st.session_state.ronda_subidas += 1
                 st.success(f"✅ Actividad '{titulo_actividad}' agregada correctamente!")
                 st.rerun()
             else:
@@ -527,7 +233,7 @@ with tab1:
                 "Fotografías ANTES",
                 type=["png", "jpg", "jpeg"],
                 accept_multiple_files=True,
-                key="imgs_antes",
+                key=clave_subida("imgs_antes"),
             )
 
         with col_despues:
@@ -542,22 +248,20 @@ with tab1:
                 "Fotografías DESPUÉS",
                 type=["png", "jpg", "jpeg"],
                 accept_multiple_files=True,
-                key="imgs_despues",
+                key=clave_subida("imgs_despues"),
             )
 
         if st.button("➕ Agregar Actividad", type="primary", use_container_width=True):
             if titulo_actividad and (obs_antes or obs_despues):
                 # Procesar imágenes ANTES
                 antes_bytes = []
-                if imgs_antes:
-                    for img in imgs_antes:
-                        antes_bytes.append(img.read())
+                for img in archivos_subidos(imgs_antes):
+                    antes_bytes.append(optimizar_imagen(img.read()))
 
                 # Procesar imágenes DESPUÉS
                 despues_bytes = []
-                if imgs_despues:
-                    for img in imgs_despues:
-                        despues_bytes.append(img.read())
+                for img in archivos_subidos(imgs_despues):
+                    despues_bytes.append(optimizar_imagen(img.read()))
 
                 actividad = {
                     "titulo": titulo_actividad,
@@ -574,6 +278,14 @@ with tab1:
                     ),
                 }
                 st.session_state.actividades.append(actividad)
+
+                # Liberar las subidas originales y vaciar los widgets
+                if sesion_actual is not None:
+                    liberar_subidas(
+                        sesion_actual,
+                        archivos_subidos(imgs_antes) + archivos_subidos(imgs_despues),
+                    )
+                st.session_state.ronda_subidas += 1
                 st.success(f"✅ Actividad '{titulo_actividad}' agregada correctamente!")
                 st.rerun()
             else:
@@ -672,26 +384,26 @@ with tab3:
         st.write(f"- Cliente: {cliente_nombre}")
         st.write(f"- Técnico: {empresa_tecnico}")
 
+        # Preparar datos
+        datos_empresa = {
+            "nombre_proyecto": empresa_nombre_proyecto,
+            "fecha": empresa_fecha,
+            "tecnico": empresa_tecnico,
+            "ubicacion": empresa_ubicacion,
+            "objetivo": empresa_objetivo,
+            "nota": empresa_nota,
+        }
+
+        datos_cliente = {
+            "nombre": cliente_nombre,
+            "nit": cliente_nit,
+            "direccion": cliente_direccion,
+        }
+
         if st.button(
             "📄 Generar Informe Técnico", type="primary", use_container_width=True
         ):
             with st.spinner("Generando documento..."):
-                # Preparar datos
-                datos_empresa = {
-                    "nombre_proyecto": empresa_nombre_proyecto,
-                    "fecha": empresa_fecha,
-                    "tecnico": empresa_tecnico,
-                    "ubicacion": empresa_ubicacion,
-                    "objetivo": empresa_objetivo,
-                    "nota": empresa_nota,
-                }
-
-                datos_cliente = {
-                    "nombre": cliente_nombre,
-                    "nit": cliente_nit,
-                    "direccion": cliente_direccion,
-                }
-
                 # Crear documento
                 doc = crear_documento_tecnico(
                     datos_empresa, datos_cliente, st.session_state.actividades
@@ -717,6 +429,141 @@ with tab3:
                     use_container_width=True,
                 )
 
+        st.markdown("---")
+        st.caption(
+            "Guarde un borrador de esta visita para incluirlo luego en el consolidado mensual."
+        )
+
+        if st.button("💾 Guardar Borrador", use_container_width=True):
+            borrador = guardar_borrador(
+                datos_empresa, datos_cliente, st.session_state.actividades
+            )
+
+            fecha_str = datetime.now().strftime("%Y%m%d")
+            nombre_borrador = f"BORRADOR_{empresa_nombre_proyecto.replace(' ', '_')}_{fecha_str}.zip"
+
+            st.download_button(
+                label="⬇️ Descargar Borrador",
+                data=borrador,
+                file_name=nombre_borrador,
+                mime="application/zip",
+                use_container_width=True,
+            )
+
+with tab4:
+    st.header("📚 Consolidado Mensual")
+
+    st.write(
+        "Combine los borradores de varias visitas de un cliente en un solo informe "
+        "con un membrete y un índice de visitas."
+    )
+
+    consolidado_periodo = st.text_input("Periodo del Consolidado", "Enero 2026")
+    archivos_borradores = st.file_uploader(
+        "Borradores de las Visitas (.zip) o manifiestos (.json)",
+        type=["zip", "json"],
+        accept_multiple_files=True,
+        key=clave_subida("borradores"),
+    )
+
+    archivos_borradores = archivos_subidos(archivos_borradores)
+
+    manifiestos = [a.name for a in archivos_borradores if a.name.lower().endswith(".json")]
+    if manifiestos:
+        st.warning(
+            "⚠️ Los manifiestos .json no incluyen las fotos; esas visitas saldrán "
+            f"sin registro fotográfico: {', '.join(manifiestos)}. Para incluirlas, "
+            "suba el borrador .zip."
+        )
+
+    if not archivos_borradores:
+        st.info("ℹ️ Suba los borradores guardados desde 'Generar Documento'.")
+    elif st.button(
+        "📚 Generar Informe Consolidado", type="primary", use_container_width=True
+    ):
+        with st.spinner("Generando consolidado..."):
+            # El documento se escribe en disco; las fotos no se acumulan en memoria
+            doc_archivo = tempfile.TemporaryFile()
+            try:
+                # Los borradores se leen uno a uno mientras se arma el documento
+                guardar_documento_consolidado(
+                    (leer_borrador(archivo) for archivo in archivos_borradores),
+                    consolidado_periodo,
+                    doc_archivo,
+                )
+            except (zipfile.BadZipFile, KeyError, ValueError) as e:
+                doc_archivo.close()
+                st.error(f"⚠️ No se pudo generar el consolidado: {e}")
+            else:
+                doc_archivo.seek(0)
+
+                fecha_str = datetime.now().strftime("%Y%m%d")
+                nombre_archivo = f"INFORME_CONSOLIDADO_{consolidado_periodo.replace(' ', '_')}_{fecha_str}.docx"
+
+                st.success(
+                    f"✅ ¡Consolidado generado con {len(archivos_borradores)} visitas!"
+                )
+
+                with doc_archivo:
+                    st.download_button(
+                        label="⬇️ Descargar Informe Consolidado",
+                        data=doc_archivo,
+                        file_name=nombre_archivo,
+                        mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+                        use_container_width=True,
+                    )
+
+if CLAVE_ADMIN:
+    with tab_admin[0]:
+        st.header("📊 Recursos del Servidor")
+
+        clave = st.text_input("Clave de Administrador", type="password")
+        if not clave:
+            st.info("ℹ️ Ingrese la clave de administrador para ver las sesiones.")
+        elif not hmac.compare_digest(clave.encode(), CLAVE_ADMIN.encode()):
+            st.error("⚠️ Clave incorrecta.")
+        else:
+            with registro_sesiones["lock"]:
+                filas = [
+                    {
+                        "Sesión": session_id[:8],
+                        "Actual": "✔" if session_id == sesion_actual else "",
+                        "Actividades": len(entrada["actividades"]),
+                        "Imágenes (MB)": round(entrada["bytes"] / (1024 * 1024), 2),
+                        "Subidas (MB)": round(
+                            entrada["bytes_subidas"] / (1024 * 1024), 2
+                        ),
+                        "Inactiva (min)": round(
+                            (time.time() - entrada["ultimo_uso"]) / 60, 1
+                        ),
+                        "Estado": "En disco" if entrada["expulsada"] else "En memoria",
+                    }
+                    for session_id, entrada in registro_sesiones["sesiones"].items()
+                ]
+
+            total_mb = sum(fila["Imágenes (MB)"] + fila["Subidas (MB)"] for fila in filas)
+            en_disco = sum(1 for fila in filas if fila["Estado"] == "En disco")
+
+            col1, col2, col3 = st.columns(3)
+            col1.metric("Sesiones", len(filas))
+            col2.metric("Imágenes y subidas en memoria", f"{total_mb:.1f} MB")
+            col3.metric("Sesiones en disco", en_disco)
+
+            st.caption(
+                f"Las sesiones sin uso por más de {MINUTOS_SESION_INACTIVA:g} minutos se "
+                f"guardan en disco ({DIR_SESIONES}) y se restauran al volver a usarlas."
+            )
+
+            if filas:
+                st.dataframe(filas, use_container_width=True, hide_index=True)
+
+            if st.button("🧹 Liberar Sesiones Inactivas Ahora"):
+                expulsadas = expulsar_sesiones_inactivas(
+                    registro_sesiones, sesion_actual=sesion_actual, forzar=True
+                )
+                st.success(f"✅ Sesiones liberadas: {expulsadas}")
+                st.rerun()
+
 # Footer
 st.markdown("---")
 st.markdown(
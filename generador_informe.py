@@ -0,0 +1,821 @@
+"""
+Generación de los informes técnicos de Rotomaquinas en Word (.docx).
+
+Funciones sin dependencia de Streamlit: las usa `app_informe_tecnico.py` y se
+pueden importar desde las pruebas.
+"""
+
+from docx import Document
+from docx.shared import Inches, Pt, RGBColor
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.image.image import Image as ImagenDocx
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
+from docx.opc.packuri import PackURI
+from docx.opc.part import Part
+from docx.oxml.ns import qn
+from docx.oxml import OxmlElement
+from docx.oxml.shape import CT_Inline
+from PIL import Image, ImageMath
+import io
+import os
+import json
+import hashlib
+import tempfile
+import zipfile
+from datetime import datetime
+
+# Logo del membrete, relativo a este archivo para no depender del directorio actual
+LOGO_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "logo.png")
+
+
+# Función para establecer bordes de celda
+def set_cell_border(cell, **kwargs):
+    """
+    Establecer bordes de celda en la tabla.
+    """
+    tc = cell._tc
+    tcPr = tc.get_or_add_tcPr()
+
+    # Lista de bordes
+    for edge in ("top", "left", "bottom", "right"):
+        edge_data = kwargs.get(edge)
+        if edge_data:
+            tag = "w:{}".format(edge)
+            element = OxmlElement(tag)
+            for key in edge_data:
+                element.set(qn("w:{}".format(key)), str(edge_data[key]))
+            tcPr.append(element)
+
+
+# Función para agregar imagen centrada en celda
+def add_image_to_cell(cell, image_bytes, width_inches=2.5):
+    """
+    Agregar imagen centrada en una celda.
+    """
+    paragraph = cell.paragraphs[0]
+    paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    run = paragraph.add_run()
+    run.add_picture(io.BytesIO(image_bytes), width=Inches(width_inches))
+
+
+# Máximo de colores distintos (en una muestra reducida) para tratar un PNG como gráfico
+MAX_COLORES_GRAFICO = 4096
+
+
+# Función para optimizar una imagen según su formato
+def optimizar_imagen(image_bytes):
+    """
+    Preparar una imagen subida para incrustarla en el documento.
+
+    Los JPEG se dejan igual. Los PNG fotográficos se convierten a JPEG y los
+    gráficos (capturas, diagramas) se quedan en PNG con paleta reducida. La
+    transparencia se aplana sobre fondo blanco.
+    """
+    try:
+        img = Image.open(io.BytesIO(image_bytes))
+        if img.format != "PNG":
+            return image_bytes
+
+        # Escala de grises de 16 bits: llevar a 8 bits (convert("RGB") la recorta)
+        if img.mode in ("I", "I;16", "I;16B", "I;16L"):
+            gris = img.convert("I")
+            transparente = img.info.get("transparency")
+            img = gris.point(lambda v: v * (1 / 256)).convert("L")
+            if isinstance(transparente, int):
+                # El nivel transparente (tRNS) está en 16 bits: armar el canal
+                # alfa antes de reducir, cuando aún no se confunde con otros
+                alfa = ImageMath.lambda_eval(
+                    lambda a: (a["gris"] != transparente) * 255, gris=gris
+                ).convert("L")
+                img = Image.merge("LA", (img, alfa))
+
+        # Aplanar transparencia sobre fondo blanco
+        tiene_alfa = img.mode in ("RGBA", "LA", "PA") or "transparency" in img.info
+        if tiene_alfa:
+            img = img.convert("RGBA")
+            fondo = Image.new("RGB", img.size, (255, 255, 255))
+            fondo.paste(img, mask=img.getchannel("A"))
+            img = fondo
+        elif img.mode != "L":
+            img = img.convert("RGB")
+
+        # Clasificar por número de colores en una muestra (sin interpolar)
+        escala = min(1.0, 256 / max(img.size))
+        muestra = img.resize(
+            (max(1, round(img.width * escala)), max(1, round(img.height * escala))),
+            resample=Image.Resampling.NEAREST,
+        )
+        colores = muestra.getcolors(maxcolors=MAX_COLORES_GRAFICO)
+
+        salida = io.BytesIO()
+        if colores is None:
+            # Fotografía: JPEG
+            img.save(salida, format="JPEG", quality=85, optimize=True)
+        elif img.mode == "L":
+            # Escala de grises: ya tiene como mucho 256 niveles
+            img.save(salida, format="PNG", optimize=True)
+        else:
+            # Gráfico: PNG con paleta de hasta 256 colores. Con 256 colores o
+            # menos MEDIANCUT conserva los colores exactos; con más, FASTOCTREE
+            # es mucho más rápido y la pérdida es inevitable.
+            img.quantize(
+                colors=min(len(colores), 256),
+                method=(
+                    Image.Quantize.MEDIANCUT
+                    if len(colores) <= 256
+                    else Image.Quantize.FASTOCTREE
+                ),
+                dither=Image.Dither.NONE,
+            ).save(salida, format="PNG", optimize=True)
+    except Exception as e:
+        print(f"Error optimizando imagen: {e}")
+        return image_bytes
+
+    # Si no hubo que aplanar y no se ganó espacio, conservar el original
+    if not tiene_alfa and salida.tell() >= len(image_bytes):
+        return image_bytes
+    return salida.getvalue()
+
+
+# Función para crear el documento con estilos, márgenes y membrete
+def crear_documento_base():
+    """
+    Crear un documento vacío con estilos globales, márgenes y membrete.
+    """
+    doc = Document()
+
+    # Estilos Globales
+    style = doc.styles["Normal"]
+    font = style.font
+    font.name = "Arial"
+    font.size = Pt(10)
+
+    # Configurar márgenes (2.54 cm ~ 1 pulgada)
+    sections = doc.sections
+    for section in sections:
+        section.top_margin = Inches(1)
+        section.bottom_margin = Inches(1)
+        section.left_margin = Inches(1)
+        section.right_margin = Inches(1)
+
+        # ============= ENCABEZADO (MEMBRETE) =============
+        header = section.header
+        header_table = header.add_table(rows=1, cols=2, width=Inches(6.5))
+        header_table.autofit = False
+
+        # Celda Logo (Izquierda)
+        cell_logo = header_table.cell(0, 0)
+        cell_logo.width = Inches(2.0)
+        try:
+            paragraph = cell_logo.paragraphs[0]
+            paragraph.alignment = WD_ALIGN_PARAGRAPH.LEFT
+            run = paragraph.add_run()
+            run.add_picture(LOGO_PATH, width=Inches(1.3))
+        except Exception as e:
+            cell_logo.text = "[LOGO]"
+            print(f"Error cargando logo: {e}")
+
+        # Celda Información Empresa (Derecha)
+        cell_info = header_table.cell(0, 1)
+        cell_info.width = Inches(4.5)
+        paragraph = cell_info.paragraphs[0]
+        paragraph.alignment = WD_ALIGN_PARAGRAPH.RIGHT
+
+        run = paragraph.add_run("ROTOMAQUINAS S.A.S\n")
+        run.font.bold = True
+        run.font.size = Pt(14)
+        run.font.color.rgb = RGBColor(0, 51, 102)  # Azul oscuro corporativo
+
+        run = paragraph.add_run("Servicios Operativos con Máquinas y Personal\n")
+        run.font.size = Pt(9)
+        run.font.bold = True
+
+        run = paragraph.add_run("Palmira - Valle del Cauca\n")
+        run.font.size = Pt(9)
+
+        run = paragraph.add_run(f"Fecha: {datetime.now().strftime('%d/%m/%Y')}")
+        run.font.size = Pt(8)
+        run.font.italic = True
+
+    return doc
+
+
+# Función para agregar una tabla de datos (etiqueta sombreada | valor)
+def agregar_tabla_datos(doc, filas):
+    """
+    Agregar una tabla de dos columnas con etiquetas en negrita y sombreadas.
+    """
+    table = doc.add_table(rows=len(filas), cols=2)
+    table.style = "Table Grid"
+
+    for i, (label, value) in enumerate(filas):
+        row = table.rows[i]
+
+        # Etiqueta
+        cell_label = row.cells[0]
+        cell_label.width = Inches(2.5)
+        p = cell_label.paragraphs[0]
+        run = p.add_run(label)
+        run.font.bold = True
+        run.font.size = Pt(10)
+        # Sombreado gris suave
+        shading_elm = OxmlElement("w:shd")
+        shading_elm.set(qn("w:fill"), "F2F2F2")
+        cell_label._element.get_or_add_tcPr().append(shading_elm)
+
+        # Valor
+        cell_value = row.cells[1]
+        cell_value.text = value
+        cell_value.paragraphs[0].runs[0].font.size = Pt(10)
+
+    return table
+
+
+# Función para agregar el bloque de actividades (registro fotográfico)
+def agregar_actividades(doc, actividades, agregar_imagen=add_image_to_cell):
+    """
+    Agregar las actividades con sus observaciones e imágenes.
+
+    `agregar_imagen` tiene la misma firma que `add_image_to_cell`.
+    """
+    # ============= ACTIVIDADES =============
+    for actividad in actividades:
+        # Título de la actividad
+        p = doc.add_paragraph()
+        run = p.add_run(actividad["titulo"].upper())
+        run.font.bold = True
+        run.font.size = Pt(11)
+        p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+        doc.add_paragraph()
+
+        # Si solo hay observación (sin ANTES/DESPUÉS)
+        if actividad["tipo"] == "solo_observacion":
+            # Tabla de observación
+            tabla_obs = doc.add_table(rows=2, cols=1)
+            tabla_obs.style = "Table Grid"
+
+            # Fila 1: OBSERVACIÓN
+            cell = tabla_obs.rows[0].cells[0]
+            p_cell = cell.paragraphs[0]
+            run = p_cell.add_run("OBSERVACIÓN: ")
+            run.font.bold = True
+            p_cell.add_run(actividad["observacion"])
+
+            # Aplicar bordes
+            set_cell_border(
+                cell,
+                top={"sz": 12, "val": "single", "color": "000000"},
+                bottom={"sz": 12, "val": "single", "color": "000000"},
+                left={"sz": 12, "val": "single", "color": "000000"},
+                right={"sz": 12, "val": "single", "color": "000000"},
+            )
+
+            # Fila 2: Imágenes
+            cell_img = tabla_obs.rows[1].cells[0]
+            if actividad.get("imagenes"):
+                # Crear una tabla interna para organizar las imágenes
+                num_imagenes = len(actividad["imagenes"])
+                cols = min(num_imagenes, 2)  # Máximo 2 columnas
+                rows = (num_imagenes + cols - 1) // cols
+
+                for idx, img_bytes in enumerate(actividad["imagenes"]):
+                    if idx > 0 and idx % cols == 0:
+                        cell_img.add_paragraph()
+                    agregar_imagen(cell_img, img_bytes, width_inches=2.2)
+
+            # Aplicar bordes
+            set_cell_border(
+                cell_img,
+                top={"sz": 12, "val": "single", "color": "000000"},
+                bottom={"sz": 12, "val": "single", "color": "000000"},
+                left={"sz": 12, "val": "single", "color": "000000"},
+                right={"sz": 12, "val": "single", "color": "000000"},
+            )
+
+        # Si hay ANTES/DESPUÉS
+        elif actividad["tipo"] == "antes_despues":
+            # ANTES
+            if actividad.get("antes"):
+                tabla_antes = doc.add_table(rows=3, cols=1)
+                tabla_antes.style = "Table Grid"
+
+                # Fila 1: Título ANTES
+                cell = tabla_antes.rows[0].cells[0]
+                p_cell = cell.paragraphs[0]
+                run = p_cell.add_run("ANTES")
+                run.font.bold = True
+                run.font.size = Pt(11)
+                p_cell.alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+                # Color de fondo
+                shading_elm = OxmlElement("w:shd")
+                shading_elm.set(qn("w:fill"), "D9D9D9")
+                cell._element.get_or_add_tcPr().append(shading_elm)
+
+                set_cell_border(
+                    cell,
+                    top={"sz": 12, "val": "single", "color": "000000"},
+                    bottom={"sz": 12, "val": "single", "color": "000000"},
+                    left={"sz": 12, "val": "single", "color": "000000"},
+                    right={"sz": 12, "val": "single", "color": "000000"},
+                )
+
+                # Fila 2: Observación ANTES
+                cell = tabla_antes.rows[1].cells[0]
+                p_cell = cell.paragraphs[0]
+                run = p_cell.add_run("OBSERVACIÓN: ")
+                run.font.bold = True
+                p_cell.add_run(actividad["antes"]["observacion"])
+
+                set_cell_border(
+                    cell,
+                    top={"sz": 12, "val": "single", "color": "000000"},
+                    bottom={"sz": 12, "val": "single", "color": "000000"},
+                    left={"sz": 12, "val": "single", "color": "000000"},
+                    right={"sz": 12, "val": "single", "color": "000000"},
+                )
+
+                # Fila 3: Imágenes ANTES
+                cell_img = tabla_antes.rows[2].cells[0]
+                if actividad["antes"].get("imagenes"):
+                    for img_bytes in actividad["antes"]["imagenes"]:
+                        agregar_imagen(cell_img, img_bytes, width_inches=2.2)
+
+                set_cell_border(
+                    cell_img,
+                    top={"sz": 12, "val": "single", "color": "000000"},
+                    bottom={"sz": 12, "val": "single", "color": "000000"},
+                    left={"sz": 12, "val": "single", "color": "000000"},
+                    right={"sz": 12, "val": "single", "color": "000000"},
+                )
+
+                doc.add_paragraph()
+
+            # DESPUÉS
+            if actividad.get("despues"):
+                tabla_despues = doc.add_table(rows=3, cols=1)
+                tabla_despues.style = "Table Grid"
+
+                # Fila 1: Título DESPUÉS
+                cell = tabla_despues.rows[0].cells[0]
+                p_cell = cell.paragraphs[0]
+                run = p_cell.add_run("DESPUÉS")
+                run.font.bold = True
+                run.font.size = Pt(11)
+                p_cell.alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+                # Color de fondo
+                shading_elm = OxmlElement("w:shd")
+                shading_elm.set(qn("w:fill"), "D9D9D9")
+                cell._element.get_or_add_tcPr().append(shading_elm)
+
+                set_cell_border(
+                    cell,
+                    top={"sz": 12, "val": "single", "color": "000000"},
+                    bottom={"sz": 12, "val": "single", "color": "000000"},
+                    left={"sz": 12, "val": "single", "color": "000000"},
+                    right={"sz": 12, "val": "single", "color": "000000"},
+                )
+
+                # Fila 2: Observación DESPUÉS
+                cell = tabla_despues.rows[1].cells[0]
+                p_cell = cell.paragraphs[0]
+                run = p_cell.add_run("OBSERVACIÓN: ")
+                run.font.bold = True
+                p_cell.add_run(actividad["despues"]["observacion"])
+
+                set_cell_border(
+                    cell,
+                    top={"sz": 12, "val": "single", "color": "000000"},
+                    bottom={"sz": 12, "val": "single", "color": "000000"},
+                    left={"sz": 12, "val": "single", "color": "000000"},
+                    right={"sz": 12, "val": "single", "color": "000000"},
+                )
+
+                # Fila 3: Imágenes DESPUÉS
+                cell_img = tabla_despues.rows[2].cells[0]
+                if actividad["despues"].get("imagenes"):
+                    for img_bytes in actividad["despues"]["imagenes"]:
+                        agregar_imagen(cell_img, img_bytes, width_inches=2.2)
+
+                set_cell_border(
+                    cell_img,
+                    top={"sz": 12, "val": "single", "color": "000000"},
+                    bottom={"sz": 12, "val": "single", "color": "000000"},
+                    left={"sz": 12, "val": "single", "color": "000000"},
+                    right={"sz": 12, "val": "single", "color": "000000"},
+                )
+
+        doc.add_paragraph()
+
+
+# Función principal para crear el documento
+def crear_documento_tecnico(datos_empresa, datos_cliente, actividades):
+    """
+    Crear el documento técnico completo.
+    """
+    doc = crear_documento_base()
+
+    # ============= TÍTULO DEL REPORTE =============
+    p_title = doc.add_paragraph()
+    p_title.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    run = p_title.add_run(
+        f"INFORME TÉCNICO: {datos_empresa['nombre_proyecto'].upper()}"
+    )
+    run.font.bold = True
+    run.font.size = Pt(14)
+    run.font.color.rgb = RGBColor(0, 51, 102)  # Azul oscuro
+
+    # Espacio
+    doc.add_paragraph()
+
+    # ============= TABLA DE DATOS GENERALES (Rediseñada) =============
+    agregar_tabla_datos(
+        doc,
+        [
+            ("Fecha del Servicio:", datos_empresa["fecha"]),
+            ("Técnico Responsable:", datos_empresa["tecnico"]),
+            ("Ubicación:", datos_empresa["ubicacion"]),
+            ("Asunto:", "Servicio de mantenimiento y limpieza"),
+        ],
+    )
+
+    doc.add_paragraph()
+
+    # ============= DATOS DEL CLIENTE =============
+    p = doc.add_paragraph()
+    run = p.add_run("DATOS DEL CLIENTE")
+    run.font.bold = True
+    run.font.size = Pt(11)
+    run.font.color.rgb = RGBColor(0, 51, 102)
+
+    agregar_tabla_datos(
+        doc,
+        [
+            ("Razon Social / Nombre:", datos_cliente["nombre"]),
+            ("NIT / C.C:", datos_cliente["nit"]),
+            ("Dirección:", datos_cliente["direccion"]),
+        ],
+    )
+
+    doc.add_paragraph()
+
+    # ============= OBJETIVO =============
+    p = doc.add_paragraph()
+    run = p.add_run("OBJETIVO")
+    run.font.bold = True
+    run.font.size = Pt(11)
+
+    p = doc.add_paragraph(datos_empresa["objetivo"])
+
+    doc.add_paragraph()
+
+    # ============= NOTA =============
+    p = doc.add_paragraph()
+    run = p.add_run("NOTA:  ")
+    run.font.bold = True
+    run = p.add_run(datos_empresa["nota"])
+
+    doc.add_paragraph()
+
+    # ============= REGISTRO FOTOGRÁFICO =============
+    p = doc.add_paragraph()
+    run = p.add_run("REGISTRO FOTOGRÁFICO")
+    run.font.bold = True
+    run.font.size = Pt(12)
+    p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+    doc.add_paragraph()
+
+    # ============= ACTIVIDADES =============
+    agregar_actividades(doc, actividades)
+
+    return doc
+
+
+# Función para recorrer los bloques de una actividad que llevan imágenes
+def mapear_imagenes(actividad, funcion):
+    """
+    Devolver una copia de la actividad aplicando `funcion` a cada imagen.
+
+    Las imágenes para las que `funcion` devuelve None se omiten.
+    """
+
+    def mapear(imagenes):
+        return [r for r in (funcion(img) for img in imagenes) if r is not None]
+
+    copia = dict(actividad)
+    if copia["tipo"] == "solo_observacion":
+        copia["imagenes"] = mapear(copia.get("imagenes", []))
+    else:
+        for momento in ("antes", "despues"):
+            if copia.get(momento):
+                bloque = dict(copia[momento])
+                bloque["imagenes"] = mapear(bloque.get("imagenes", []))
+                copia[momento] = bloque
+    return copia
+
+
+# Función para guardar un borrador (manifiesto + imágenes) en un .zip
+def guardar_borrador(datos_empresa, datos_cliente, actividades):
+    """
+    Empaquetar los datos del informe y sus imágenes en un borrador .zip.
+
+    Las imágenes se guardan una sola vez por contenido (SHA-1) y el manifiesto
+    las referencia por nombre.
+    """
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        escritas = set()
+
+        def escribir_imagen(img_bytes):
+            nombre = f"imagenes/{hashlib.sha1(img_bytes).hexdigest()}"
+            if nombre not in escritas:
+                # Las imágenes ya vienen comprimidas (JPEG/PNG)
+                zf.writestr(nombre, img_bytes, compress_type=zipfile.ZIP_STORED)
+                escritas.add(nombre)
+            return nombre
+
+        manifiesto = {
+            "version": 1,
+            "datos_empresa": datos_empresa,
+            "datos_cliente": datos_cliente,
+            "actividades": [
+                mapear_imagenes(actividad, escribir_imagen) for actividad in actividades
+            ],
+        }
+        zf.writestr(
+            "manifiesto.json",
+            json.dumps(manifiesto, ensure_ascii=False, indent=2),
+            compress_type=zipfile.ZIP_DEFLATED,
+        )
+
+    return buffer.getvalue()
+
+
+# Función para validar la forma del manifiesto de un borrador
+def validar_manifiesto(manifiesto):
+    """
+    Lanzar ValueError si el manifiesto no tiene la forma que escribe
+    `guardar_borrador`.
+    """
+    if not (
+        isinstance(manifiesto, dict)
+        and isinstance(manifiesto.get("datos_empresa", {}), dict)
+        and isinstance(manifiesto.get("datos_cliente", {}), dict)
+        and isinstance(manifiesto.get("actividades", []), list)
+        and all(isinstance(a, dict) for a in manifiesto.get("actividades", []))
+    ):
+        raise ValueError("El manifiesto no tiene el formato de un borrador.")
+
+
+# Función para leer un borrador (.zip) o un manifiesto (.json)
+def leer_borrador(archivo):
+    """
+    Leer un borrador y devolver (datos_empresa, datos_cliente, actividades).
+
+    Acepta el .zip generado por `guardar_borrador` o un manifiesto .json
+    suelto; en este último las referencias a imágenes no se pueden resolver y
+    se omiten. Si el manifiesto no es válido se lanza ValueError.
+    """
+    if zipfile.is_zipfile(archivo):
+        archivo.seek(0)
+        with zipfile.ZipFile(archivo) as zf:
+            manifiesto = json.loads(zf.read("manifiesto.json"))
+            validar_manifiesto(manifiesto)
+            actividades = [
+                mapear_imagenes(actividad, zf.read)
+                for actividad in manifiesto.get("actividades", [])
+            ]
+    else:
+        archivo.seek(0)
+        manifiesto = json.load(archivo)
+        validar_manifiesto(manifiesto)
+        # Un manifiesto suelto solo trae el texto de las actividades
+        actividades = [
+            mapear_imagenes(actividad, lambda img: None)
+            for actividad in manifiesto.get("actividades", [])
+        ]
+
+    return (
+        manifiesto.get("datos_empresa", {}),
+        manifiesto.get("datos_cliente", {}),
+        actividades,
+    )
+
+
+# Función para identificar al cliente de un borrador
+def identificar_cliente(datos_cliente):
+    """
+    Devolver el NIT sin puntos, guiones ni espacios o, si no hay NIT, el
+    nombre en minúsculas.
+    """
+    nit = "".join(c for c in datos_cliente.get("nit", "") if c.isalnum())
+    if nit:
+        return nit.upper()
+    return datos_cliente.get("nombre", "").strip().lower()
+
+
+# Parte de imagen del .docx cuyo contenido está en un archivo en disco
+class ImagenEnDisco(Part):
+    """
+    Parte de imagen que solo se lee del disco al guardar el documento, de a
+    una parte por vez.
+    """
+
+    def __init__(self, partname, content_type, ruta, package):
+        super().__init__(partname, content_type, package=package)
+        self._ruta = ruta
+
+    @property
+    def blob(self):
+        with open(self._ruta, "rb") as f:
+            return f.read()
+
+
+# Función para crear un `agregar_imagen` que deja las imágenes en disco
+def crear_agregador_en_disco(doc, carpeta):
+    """
+    Devolver una función con la firma de `add_image_to_cell` que escribe cada
+    imagen en `carpeta` y la enlaza al documento como `ImagenEnDisco`.
+
+    Las imágenes repetidas (mismo SHA-1) comparten una sola parte. La carpeta
+    debe existir hasta que se guarde el documento.
+    """
+    imagenes = {}  # sha1 -> (rId, nombre, ancho, alto)
+    # python-docx recalcula el siguiente id recorriendo todo el XML en cada
+    # imagen; aquí se lleva la cuenta
+    siguiente_id = [doc.part.next_id]
+
+    def agregar_imagen(cell, image_bytes, width_inches=2.5):
+        sha1 = hashlib.sha1(image_bytes).hexdigest()
+        if sha1 not in imagenes:
+            try:
+                imagen = ImagenDocx.from_blob(image_bytes)
+            except Exception as e:
+                # Los lectores de cabecera de python-docx lanzan varios tipos
+                raise ValueError(f"Imagen no reconocida: {e}") from e
+            ruta = os.path.join(carpeta, sha1)
+            with open(ruta, "wb") as f:
+                f.write(image_bytes)
+            parte = ImagenEnDisco(
+                PackURI(f"/word/media/foto{len(imagenes) + 1}.{imagen.ext}"),
+                imagen.content_type,
+                ruta,
+                doc.part.package,
+            )
+            imagenes[sha1] = (
+                doc.part.relate_to(parte, RT.IMAGE),
+                imagen.filename,
+                imagen.width,
+                imagen.height,
+            )
+        rId, nombre, ancho, alto = imagenes[sha1]
+
+        # Mismo escalado que `run.add_picture(..., width=...)`
+        cx = Inches(width_inches)
+        cy = int(round(alto * cx / ancho))
+        inline = CT_Inline.new_pic_inline(siguiente_id[0], rId, nombre, cx, cy)
+        siguiente_id[0] += 1
+
+        paragraph = cell.paragraphs[0]
+        paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        paragraph.add_run()._r.add_drawing(inline)
+
+    return agregar_imagen
+
+
+# Función para guardar el informe consolidado de varias visitas
+def guardar_documento_consolidado(borradores, periodo, destino):
+    """
+    Crear un informe consolidado con un solo membrete e índice de visitas y
+    guardarlo en `destino` (ruta o archivo abierto en modo binario).
+
+    `borradores` se recorre una sola vez y solo se decodifica un borrador a la
+    vez. Sus imágenes se pasan a una carpeta temporal y se copian al .docx al
+    guardarlo, así que en memoria solo queda el XML del cuerpo; las repetidas
+    entre visitas comparten una sola parte de imagen.
+
+    Todos los borradores deben ser del mismo cliente (mismo NIT o, si no hay
+    NIT, mismo nombre); si no, o si una imagen está dañada, se lanza
+    ValueError.
+    """
+    doc = crear_documento_base()
+
+    # ============= TÍTULO DEL REPORTE =============
+    p_title = doc.add_paragraph()
+    p_title.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    run = p_title.add_run(f"INFORME TÉCNICO CONSOLIDADO: {periodo.upper()}")
+    run.font.bold = True
+    run.font.size = Pt(14)
+    run.font.color.rgb = RGBColor(0, 51, 102)  # Azul oscuro
+
+    doc.add_paragraph()
+
+    # ============= DATOS DEL CLIENTE =============
+    # Se llenan con el primer borrador leído
+    p = doc.add_paragraph()
+    run = p.add_run("DATOS DEL CLIENTE")
+    run.font.bold = True
+    run.font.size = Pt(11)
+    run.font.color.rgb = RGBColor(0, 51, 102)
+
+    tabla_cliente = agregar_tabla_datos(
+        doc,
+        [("Razon Social / Nombre:", ""), ("NIT / C.C:", ""), ("Dirección:", "")],
+    )
+
+    doc.add_paragraph()
+
+    # ============= ÍNDICE DE VISITAS =============
+    # Las filas se agregan a medida que se recorren los borradores
+    p = doc.add_paragraph()
+    run = p.add_run("ÍNDICE DE VISITAS")
+    run.font.bold = True
+    run.font.size = Pt(11)
+    run.font.color.rgb = RGBColor(0, 51, 102)
+
+    tabla_indice = doc.add_table(rows=1, cols=5)
+    tabla_indice.style = "Table Grid"
+    for cell, titulo in zip(
+        tabla_indice.rows[0].cells,
+        ["N°", "Fecha", "Proyecto", "Técnico", "Actividades"],
+    ):
+        run = cell.paragraphs[0].add_run(titulo)
+        run.font.bold = True
+        run.font.size = Pt(10)
+        shading_elm = OxmlElement("w:shd")
+        shading_elm.set(qn("w:fill"), "D9D9D9")
+        cell._element.get_or_add_tcPr().append(shading_elm)
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        agregar_imagen = crear_agregador_en_disco(doc, carpeta)
+
+        # ============= VISITAS =============
+        num_visitas = 0
+        for datos_empresa, datos_cliente, actividades in borradores:
+            num_visitas += 1
+
+            if num_visitas == 1:
+                cliente = identificar_cliente(datos_cliente)
+                for i, clave in enumerate(["nombre", "nit", "direccion"]):
+                    cell_value = tabla_cliente.cell(i, 1)
+                    cell_value.paragraphs[0].runs[0].text = datos_cliente.get(clave, "")
+            elif identificar_cliente(datos_cliente) != cliente:
+                raise ValueError(
+                    f"La visita {num_visitas} es de otro cliente "
+                    f"({datos_cliente.get('nombre', '')}); el consolidado debe ser "
+                    "de un solo cliente."
+                )
+
+            proyecto = datos_empresa.get("nombre_proyecto", "")
+
+            # Fila del índice
+            row = tabla_indice.add_row()
+            valores = [
+                str(num_visitas),
+                datos_empresa.get("fecha", ""),
+                proyecto,
+                datos_empresa.get("tecnico", ""),
+                str(len(actividades)),
+            ]
+            for cell, valor in zip(row.cells, valores):
+                cell.text = valor
+                cell.paragraphs[0].runs[0].font.size = Pt(10)
+
+            # Cada visita empieza en una página nueva
+            doc.add_page_break()
+
+            p = doc.add_paragraph()
+            p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+            run = p.add_run(f"VISITA {num_visitas}: {proyecto.upper()}")
+            run.font.bold = True
+            run.font.size = Pt(12)
+            run.font.color.rgb = RGBColor(0, 51, 102)
+
+            doc.add_paragraph()
+
+            agregar_tabla_datos(
+                doc,
+                [
+                    ("Fecha del Servicio:", datos_empresa.get("fecha", "")),
+                    ("Técnico Responsable:", datos_empresa.get("tecnico", "")),
+                    ("Ubicación:", datos_empresa.get("ubicacion", "")),
+                ],
+            )
+
+            doc.add_paragraph()
+
+            try:
+                agregar_actividades(doc, actividades, agregar_imagen)
+            except ValueError as e:
+                raise ValueError(
+                    f"La visita {num_visitas} ({proyecto}) tiene una imagen dañada "
+                    "o en un formato no admitido."
+                ) from e
+
+        if num_visitas == 0:
+            raise ValueError("No se recibieron borradores para consolidar.")
+
+        doc.save(destino)
@@ -0,0 +1,251 @@
+"""
+Contabilidad de memoria por sesión de Streamlit y expulsión a disco de las
+sesiones inactivas.
+
+El registro es un diccionario compartido por todas las sesiones del servidor
+(la app lo guarda con `st.cache_resource`):
+
+    {"lock": threading.Lock(), "ultimo_barrido": float, "sesiones": {session_id: entrada}}
+
+Cada entrada guarda la lista de actividades de la sesión (la misma que tiene
+su `st.session_state`), los bytes de imágenes y de archivos subidos, la hora
+del último uso y, si fue expulsada, la ruta del borrador en disco.
+"""
+
+import os
+import tempfile
+import threading
+import time
+
+from streamlit import runtime
+
+from generador_informe import guardar_borrador, leer_borrador
+
+# Minutos sin uso tras los cuales las actividades de una sesión se pasan a disco
+MINUTOS_SESION_INACTIVA = float(os.environ.get("INFORME_MINUTOS_INACTIVA", "30"))
+# Horas que se conservan en disco los borradores de sesiones inactivas
+HORAS_RETENCION_BORRADORES = float(os.environ.get("INFORME_HORAS_RETENCION", "24"))
+# Carpeta donde se guardan los borradores de sesiones inactivas
+DIR_SESIONES = os.environ.get(
+    "INFORME_DIR_SESIONES",
+    os.path.join(tempfile.gettempdir(), "informe_tecnico_sesiones"),
+)
+# Intervalo mínimo entre dos barridos de sesiones inactivas
+SEGUNDOS_ENTRE_BARRIDOS = 60
+
+# Estados que devuelve `registrar_sesion`
+SESION_ACTIVA = "activa"
+SESION_RESTAURADA = "restaurada"
+SESION_RENOVAR_SUBIDAS = "renovar_subidas"
+SESION_ERROR_RESTAURANDO = "error_restaurando"
+
+
+# Función para crear un registro de sesiones vacío
+def crear_registro():
+    """
+    Crear el registro compartido de sesiones.
+    """
+    return {"lock": threading.Lock(), "ultimo_barrido": 0.0, "sesiones": {}}
+
+
+# Función para contar los bytes de imágenes de una lista de actividades
+def contar_bytes_imagenes(actividades):
+    """
+    Sumar el tamaño de todas las imágenes guardadas en las actividades.
+    """
+    total = 0
+    for actividad in actividades:
+        if actividad["tipo"] == "solo_observacion":
+            bloques = [actividad]
+        else:
+            bloques = [actividad.get("antes"), actividad.get("despues")]
+        for bloque in bloques:
+            if bloque:
+                total += sum(len(img) for img in bloque.get("imagenes", []))
+    return total
+
+
+# Función para liberar los archivos subidos de una sesión
+def liberar_subidas(session_id, archivos=None):
+    """
+    Quitar del gestor de archivos de Streamlit los archivos subidos de la
+    sesión: los indicados en `archivos` o, si es None, todos.
+    """
+    if not runtime.exists():
+        return
+    gestor = runtime.get_instance().uploaded_file_mgr
+    if archivos is None:
+        gestor.remove_session_files(session_id)
+    else:
+        for archivo in archivos:
+            gestor.remove_file(session_id, archivo.file_id)
+
+
+# Función para registrar el uso de la sesión actual
+def registrar_sesion(registro, session_id, actividades, bytes_subidas=0):
+    """
+    Marcar la sesión como usada y actualizar su consumo de memoria.
+
+    Si la sesión había sido expulsada, sus actividades se restauran desde el
+    disco al inicio de la misma lista y se devuelve SESION_RESTAURADA. Si
+    además se liberaron sus archivos subidos y en esta ejecución no hay
+    subidas nuevas, se devuelve SESION_RENOVAR_SUBIDAS: la app debe renovar
+    esos widgets, que aún muestran los archivos liberados. Si el borrador no
+    se puede leer se conserva en disco (se reintenta en la siguiente
+    ejecución) y se devuelve SESION_ERROR_RESTAURANDO.
+
+    Como en la expulsión, el candado no se tiene mientras se lee el disco.
+    """
+    estado = SESION_ACTIVA
+
+    with registro["lock"]:
+        entrada = registro["sesiones"].get(session_id)
+        expulsada = bool(entrada and entrada["expulsada"])
+        subidas_liberadas = bool(entrada and entrada["subidas_liberadas"])
+        archivo = entrada["archivo"] if entrada else None
+        if archivo:
+            # Quitarle el archivo a la entrada para que ni el barrido ni otra
+            # ejecución lo borren o lo lean mientras se restaura
+            entrada["archivo"] = None
+            entrada["ultimo_uso"] = time.time()
+
+    restauradas = []
+    if archivo:
+        try:
+            with open(archivo, "rb") as f:
+                _, _, restauradas = leer_borrador(f)
+        except Exception as e:
+            print(f"Error restaurando sesión {session_id}: {e}")
+            estado = SESION_ERROR_RESTAURANDO
+
+    with registro["lock"]:
+        if estado == SESION_ACTIVA and archivo:
+            # Al inicio, por si la sesión agregó actividades mientras tanto
+            actividades[:0] = restauradas
+            os.remove(archivo)
+            archivo = None
+
+        if expulsada and estado == SESION_ACTIVA:
+            if subidas_liberadas and not bytes_subidas:
+                estado = SESION_RENOVAR_SUBIDAS
+            else:
+                estado = SESION_RESTAURADA
+
+        registro["sesiones"][session_id] = {
+            "actividades": actividades,
+            "bytes": contar_bytes_imagenes(actividades),
+            "bytes_subidas": bytes_subidas,
+            "ultimo_uso": time.time(),
+            "expulsada": archivo is not None,
+            "subidas_liberadas": subidas_liberadas and archivo is not None,
+            "archivo": archivo,
+        }
+
+    return estado
+
+
+# Función para escribir en disco el borrador de una sesión
+def escribir_borrador_sesion(session_id, actividades):
+    """
+    Guardar las actividades en DIR_SESIONES/<session_id>.zip y devolver la
+    ruta. La carpeta es privada (0700) y el archivo se escribe en uno
+    temporal que luego se renombra, para no dejar borradores a medias.
+    """
+    os.makedirs(DIR_SESIONES, mode=0o700, exist_ok=True)
+    os.chmod(DIR_SESIONES, 0o700)
+
+    archivo = os.path.join(DIR_SESIONES, f"{session_id}.zip")
+    fd, temporal = tempfile.mkstemp(dir=DIR_SESIONES, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(guardar_borrador({}, {}, actividades))
+        os.replace(temporal, archivo)
+    except BaseException:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        raise
+
+    return archivo
+
+
+# Función para pasar a disco las sesiones inactivas
+def expulsar_sesiones_inactivas(
+    registro, minutos=MINUTOS_SESION_INACTIVA, sesion_actual=None, forzar=False
+):
+    """
+    Guardar en disco las actividades de las sesiones sin uso, liberarlas de
+    memoria junto con sus archivos subidos y devolver cuántas se expulsaron.
+
+    Como mucho se hace un barrido cada SEGUNDOS_ENTRE_BARRIDOS (salvo con
+    `forzar`). El candado del registro solo se toma para elegir candidatas y
+    para confirmar la expulsión; la escritura a disco se hace fuera de él.
+    """
+    ahora = time.time()
+    vencidos = []
+    candidatas = []
+
+    with registro["lock"]:
+        if not forzar and ahora - registro["ultimo_barrido"] < SEGUNDOS_ENTRE_BARRIDOS:
+            return 0
+        registro["ultimo_barrido"] = ahora
+
+        for session_id, entrada in list(registro["sesiones"].items()):
+            if entrada["expulsada"]:
+                # Borradores que nadie reclamó dentro del periodo de retención
+                if ahora - entrada["ultimo_uso"] > HORAS_RETENCION_BORRADORES * 3600:
+                    if entrada["archivo"]:
+                        vencidos.append(entrada["archivo"])
+                    del registro["sesiones"][session_id]
+                continue
+
+            if runtime.exists() and not runtime.get_instance().is_active_session(
+                session_id
+            ):
+                # Streamlit ya descartó la sesión: soltar la referencia
+                del registro["sesiones"][session_id]
+                continue
+
+            if (
+                session_id == sesion_actual
+                or ahora - entrada["ultimo_uso"] < minutos * 60
+                or not (entrada["actividades"] or entrada["bytes_subidas"])
+            ):
+                continue
+
+            candidatas.append((session_id, entrada, list(entrada["actividades"])))
+
+    for archivo in vencidos:
+        if os.path.exists(archivo):
+            os.remove(archivo)
+
+    expulsadas = 0
+    for session_id, entrada, actividades in candidatas:
+        archivo = None
+        if actividades:
+            try:
+                archivo = escribir_borrador_sesion(session_id, actividades)
+            except Exception as e:
+                print(f"Error guardando sesión {session_id}: {e}")
+                continue
+
+        with registro["lock"]:
+            # Si la sesión se usó mientras tanto, su entrada ya es otra
+            vigente = registro["sesiones"].get(session_id) is entrada
+            if vigente:
+                # Vaciar la misma lista que tiene st.session_state de esa sesión
+                entrada["actividades"].clear()
+                entrada["bytes"] = 0
+                entrada["subidas_liberadas"] = entrada["bytes_subidas"] > 0
+                entrada["bytes_subidas"] = 0
+                entrada["expulsada"] = True
+                entrada["archivo"] = archivo
+
+        if not vigente:
+            if archivo:
+                os.remove(archivo)
+            continue
+
+        liberar_subidas(session_id)
+        expulsadas += 1
+
+    return expulsadas
@@ -0,0 +1,247 @@
+"""
+Datos fijos para las pruebas: imágenes generadas de forma determinista y
+cargas de trabajo de tamaño conocido.
+
+Ejecutado como módulo (`python -m tests.cargas <carga>`) genera el informe de
+la carga indicada e imprime en JSON el tiempo, el tamaño y la memoria máxima
+del proceso, para medirlos aislados del proceso de pytest. Con
+`python -m tests.cargas consolidado <visitas>` mide en cambio el informe
+consolidado de ese número de visitas.
+"""
+
+import io
+import json
+import random
+import sys
+import time
+
+from PIL import Image
+
+DATOS_EMPRESA = {
+    "nombre_proyecto": "Hacienda La Rita",
+    "fecha": "01 Enero 2026",
+    "tecnico": "Carlos Pérez",
+    "ubicacion": "Palmira - Valle del Cauca",
+    "objetivo": "Describir los trabajos de mantenimiento realizados.",
+    "nota": "El personal cuenta con todas las medidas de seguridad.",
+}
+
+DATOS_CLIENTE = {
+    "nombre": "Manuelita S.A.",
+    "nit": "891.300.241-9",
+    "direccion": "Km 7 vía Palmira - El Cerrito",
+}
+
+
+def imagen_foto(semilla, tamano=(640, 480)):
+    """
+    Imagen RGB con textura de fotografía (ruido suavizado), reproducible.
+    """
+    rnd = random.Random(semilla)
+    ancho, alto = tamano
+    pequena = (max(ancho // 8, 1), max(alto // 8, 1))
+    ruido = bytes(rnd.getrandbits(8) for _ in range(pequena[0] * pequena[1] * 3))
+    base = Image.frombytes("RGB", pequena, ruido).resize(tamano, Image.Resampling.BICUBIC)
+    degradado = Image.linear_gradient("L").resize(tamano).convert("RGB")
+    return Image.blend(base, degradado, 0.4)
+
+
+def a_bytes(img, formato, **opciones):
+    salida = io.BytesIO()
+    img.save(salida, format=formato, **opciones)
+    return salida.getvalue()
+
+
+def jpeg_foto(semilla, tamano=(640, 480)):
+    return a_bytes(imagen_foto(semilla, tamano), "JPEG", quality=85)
+
+
+def actividades_mixtas(imagen=jpeg_foto):
+    """
+    Una actividad de cada forma que admite el generador, con imágenes.
+    """
+    return [
+        {
+            "titulo": "Cerramiento del Área de Trabajo",
+            "tipo": "solo_observacion",
+            "observacion": "Se delimita el área con cinta y conos.",
+            "imagenes": [imagen(1), imagen(2), imagen(3)],
+        },
+        {
+            "titulo": "Fumigación del Sendero",
+            "tipo": "solo_observacion",
+            "observacion": "Sin registro fotográfico.",
+            "imagenes": [],
+        },
+        {
+            "titulo": "Limpieza de Pozo Séptico con Vactor",
+            "tipo": "antes_despues",
+            "antes": {"observacion": "Pozo colmatado.", "imagenes": [imagen(4)]},
+            "despues": {
+                "observacion": "Pozo limpio.",
+                "imagenes": [imagen(5), imagen(6)],
+            },
+        },
+        {
+            "titulo": "Lavado de Filtros",
+            "tipo": "antes_despues",
+            "antes": None,
+            "despues": {"observacion": "Filtros lavados.", "imagenes": []},
+        },
+    ]
+
+
+# Cargas fijas: (actividades, imágenes por bloque, tamaño de cada imagen)
+CARGAS = {
+    "visita_tipica": (12, 2, (1600, 1200)),
+    "visita_grande": (30, 2, (1024, 768)),
+}
+
+
+def actividades_carga(nombre):
+    """
+    Actividades de una carga fija: mitad antes/después y mitad solo
+    observación, todas con imágenes distintas.
+    """
+    num_actividades, por_bloque, tamano = CARGAS[nombre]
+    semilla = 0
+    actividades = []
+    for i in range(num_actividades):
+        imagenes = []
+        for _ in range(por_bloque * 2):
+            semilla += 1
+            imagenes.append(jpeg_foto(semilla, tamano))
+        if i % 2:
+            actividades.append(
+                {
+                    "titulo": f"Actividad {i + 1}",
+                    "tipo": "solo_observacion",
+                    "observacion": "Observación de la actividad.",
+                    "imagenes": imagenes,
+                }
+            )
+        else:
+            actividades.append(
+                {
+                    "titulo": f"Actividad {i + 1}",
+                    "tipo": "antes_despues",
+                    "antes": {"observacion": "Antes.", "imagenes": imagenes[:por_bloque]},
+                    "despues": {"observacion": "Después.", "imagenes": imagenes[por_bloque:]},
+                }
+            )
+    return actividades
+
+
+# Visitas del consolidado: imágenes por visita y tamaño de cada imagen
+IMAGENES_POR_VISITA = 4
+TAMANO_IMAGEN_VISITA = (1024, 768)
+
+
+def borradores_visitas(num_visitas):
+    """
+    Generar uno a uno los borradores (.zip) de `num_visitas` visitas del mismo
+    cliente, cada una con imágenes distintas.
+    """
+    from generador_informe import guardar_borrador
+
+    for visita in range(num_visitas):
+        semilla = visita * IMAGENES_POR_VISITA
+        imagenes = [
+            jpeg_foto(semilla + i, TAMANO_IMAGEN_VISITA) for i in range(IMAGENES_POR_VISITA)
+        ]
+        actividades = [
+            {
+                "titulo": "Limpieza de Pozo Séptico con Vactor",
+                "tipo": "antes_despues",
+                "antes": {"observacion": "Antes.", "imagenes": imagenes[:2]},
+                "despues": {"observacion": "Después.", "imagenes": imagenes[2:]},
+            }
+        ]
+        datos_empresa = dict(DATOS_EMPRESA, fecha=f"Visita {visita + 1}")
+        yield guardar_borrador(datos_empresa, DATOS_CLIENTE, actividades)
+
+
+def memoria_maxima():
+    """
+    Memoria máxima (RSS) del proceso en bytes.
+    """
+    # En Linux ru_maxrss conserva a través de exec el máximo del proceso que
+    # lanzó este (pytest); VmHWM es solo de este proceso
+    try:
+        with open("/proc/self/status") as f:
+            for linea in f:
+                if linea.startswith("VmHWM:"):
+                    return int(linea.split()[1]) * 1024
+    except OSError:
+        pass
+
+    # Solo existe en sistemas POSIX; se importa aquí para que el resto del
+    # módulo (datos de las pruebas) funcione también en Windows
+    import resource
+
+    # ru_maxrss viene en KB en Linux y en bytes en macOS
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform != "darwin":
+        maxrss *= 1024
+    return maxrss
+
+
+def medir_consolidado(num_visitas):
+    """
+    Guardar en un archivo temporal el consolidado de `num_visitas` visitas,
+    leyendo cada borrador a medida que se genera, y devolver sus métricas.
+    """
+    import tempfile
+
+    from generador_informe import guardar_documento_consolidado, leer_borrador
+
+    inicio = time.perf_counter()
+    with tempfile.TemporaryFile() as salida:
+        guardar_documento_consolidado(
+            (leer_borrador(io.BytesIO(b)) for b in borradores_visitas(num_visitas)),
+            "Enero 2026",
+            salida,
+        )
+        tamano_bytes = salida.tell()
+    duracion_s = time.perf_counter() - inicio
+
+    return {
+        "duracion_s": duracion_s,
+        "tamano_bytes": tamano_bytes,
+        "memoria_max_bytes": memoria_maxima(),
+    }
+
+
+def medir_carga(nombre):
+    """
+    Generar y guardar el informe de una carga fija y devolver sus métricas.
+    """
+    from generador_informe import crear_documento_tecnico
+
+    actividades = actividades_carga(nombre)
+
+    inicio = time.perf_counter()
+    doc = crear_documento_tecnico(DATOS_EMPRESA, DATOS_CLIENTE, actividades)
+    salida = io.BytesIO()
+    doc.save(salida)
+    duracion_s = time.perf_counter() - inicio
+
+    return {
+        "duracion_s": duracion_s,
+        "tamano_bytes": salida.tell(),
+        "memoria_max_bytes": memoria_maxima(),
+        "imagenes_bytes": sum(
+            len(img)
+            for actividad in actividades
+            for bloque in (actividad, actividad.get("antes"), actividad.get("despues"))
+            if bloque
+            for img in bloque.get("imagenes", [])
+        ),
+    }
+
+
+if __name__ == "__main__":
+    if sys.argv[1] == "consolidado":
+        print(json.dumps(medir_consolidado(int(sys.argv[2]))))
+    else:
+        print(json.dumps(medir_carga(sys.argv[1])))
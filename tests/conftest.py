@@ -0,0 +1,36 @@
+import pytest
+
+from tests.cargas import DATOS_CLIENTE, DATOS_EMPRESA, actividades_mixtas
+
+
+@pytest.fixture
+def datos_empresa():
+    return dict(DATOS_EMPRESA)
+
+
+@pytest.fixture
+def datos_cliente():
+    return dict(DATOS_CLIENTE)
+
+
+@pytest.fixture
+def actividades():
+    return actividades_mixtas()
+
+
+def pytest_terminal_summary(terminalreporter):
+    """
+    Mostrar las mediciones de rendimiento registradas con
+    `record_property("rendimiento", ...)`.
+    """
+    mediciones = [
+        valor
+        for estado in ("passed", "failed")
+        for reporte in terminalreporter.stats.get(estado, [])
+        for nombre, valor in getattr(reporte, "user_properties", [])
+        if nombre == "rendimiento"
+    ]
+    if mediciones:
+        terminalreporter.section("rendimiento")
+        for medicion in mediciones:
+            terminalreporter.write_line(medicion)
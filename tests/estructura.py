@@ -0,0 +1,41 @@
+"""
+Conteo de la estructura XML de los informes generados.
+"""
+
+
+def resumir_estructura(doc):
+    """
+    Contar tablas, sombreados, celdas con borde e imágenes en el cuerpo.
+    """
+    body = doc.element.body
+    return {
+        "tablas": len(body.xpath(".//w:tbl")),
+        "sombreados": len(body.xpath(".//w:shd")),
+        "celdas_con_borde": len(body.xpath(".//w:tcPr[w:top]")),
+        "imagenes": len(body.xpath(".//pic:pic")),
+    }
+
+
+def estructura_esperada(actividades):
+    """
+    Calcular lo que `resumir_estructura` debe devolver para un informe creado
+    con `crear_documento_tecnico` a partir de estas actividades.
+    """
+    # Tablas de datos generales (4 etiquetas) y del cliente (3 etiquetas)
+    esperada = {"tablas": 2, "sombreados": 7, "celdas_con_borde": 0, "imagenes": 0}
+
+    for actividad in actividades:
+        if actividad["tipo"] == "solo_observacion":
+            esperada["tablas"] += 1
+            esperada["celdas_con_borde"] += 2
+            esperada["imagenes"] += len(actividad.get("imagenes", []))
+        elif actividad["tipo"] == "antes_despues":
+            for momento in ("antes", "despues"):
+                if actividad.get(momento):
+                    # Título sombreado, observación e imágenes
+                    esperada["tablas"] += 1
+                    esperada["sombreados"] += 1
+                    esperada["celdas_con_borde"] += 3
+                    esperada["imagenes"] += len(actividad[momento].get("imagenes", []))
+
+    return esperada
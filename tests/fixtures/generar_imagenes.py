@@ -0,0 +1,79 @@
+"""
+Generar el corpus de imágenes de `tests/fixtures/imagenes`.
+
+    python -m tests.fixtures.generar_imagenes
+"""
+
+import os
+
+from PIL import Image, ImageDraw
+
+from tests.cargas import a_bytes, imagen_foto
+
+DIRECTORIO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "imagenes")
+TAMANO = (400, 300)
+
+
+def captura():
+    """
+    Captura de pantalla: fondo plano, texto y bloques de color.
+    """
+    img = Image.new("RGB", TAMANO, "white")
+    dibujo = ImageDraw.Draw(img)
+    dibujo.rectangle((0, 0, TAMANO[0], 24), fill=(0, 51, 102))
+    for y in range(36, TAMANO[1], 16):
+        dibujo.text((10, y), f"Informe técnico - línea {y}", fill=(30, 30, 30))
+    dibujo.rectangle((280, 60, 380, 160), fill=(242, 242, 242), outline=(0, 0, 0))
+    return img
+
+
+def foto_rgba():
+    """
+    Fotografía con el cuarto izquierdo totalmente transparente.
+    """
+    img = imagen_foto(2, TAMANO).convert("RGBA")
+    alfa = Image.new("L", TAMANO, 255)
+    alfa.paste(0, (0, 0, TAMANO[0] // 4, TAMANO[1]))
+    img.putalpha(alfa)
+    return img
+
+
+def paleta_transparente():
+    """
+    Imagen con paleta donde el índice 0 es transparente (mitad izquierda).
+    """
+    img = Image.new("P", TAMANO, 1)
+    img.putpalette([255, 0, 0, 0, 0, 255] + [0] * (254 * 3))
+    img.paste(0, (0, 0, TAMANO[0] // 2, TAMANO[1]))
+    img.info["transparency"] = 0
+    return img
+
+
+def gris_16_bits(foto):
+    """
+    Fotografía en escala de grises de 16 bits (cada nivel de 8 bits * 257).
+    """
+    return foto.convert("L").convert("I").point(lambda v: v * 257).convert("I;16")
+
+
+def generar():
+    foto = imagen_foto(1, TAMANO)
+    corpus = {
+        "foto.png": a_bytes(foto, "PNG"),
+        "foto_rgba.png": a_bytes(foto_rgba(), "PNG"),
+        "captura.png": a_bytes(captura(), "PNG"),
+        "foto.jpg": a_bytes(foto, "JPEG", quality=90),
+        "gris_l.png": a_bytes(foto.convert("L"), "PNG"),
+        "gris_la.png": a_bytes(foto_rgba().convert("LA"), "PNG"),
+        "paleta_p.png": a_bytes(captura().convert("P"), "PNG"),
+        "paleta_transparente.png": a_bytes(paleta_transparente(), "PNG"),
+        "gris_16_bits.png": a_bytes(gris_16_bits(foto), "PNG"),
+    }
+    os.makedirs(DIRECTORIO, exist_ok=True)
+    for nombre, datos in corpus.items():
+        with open(os.path.join(DIRECTORIO, nombre), "wb") as f:
+            f.write(datos)
+
+
+if __name__ == "__main__":
+    generar()
@@ -0,0 +1,135 @@
+import io
+import zipfile
+
+import pytest
+from docx import Document
+
+from generador_informe import (
+    guardar_borrador,
+    guardar_documento_consolidado,
+    leer_borrador,
+)
+from tests.estructura import resumir_estructura
+
+
+def consolidar(borradores, periodo="Enero 2026"):
+    salida = io.BytesIO()
+    guardar_documento_consolidado(borradores, periodo, salida)
+    return salida
+
+
+def test_borrador_ida_y_vuelta(datos_empresa, datos_cliente, actividades):
+    borrador = guardar_borrador(datos_empresa, datos_cliente, actividades)
+
+    assert leer_borrador(io.BytesIO(borrador)) == (
+        datos_empresa,
+        datos_cliente,
+        actividades,
+    )
+
+
+def test_borrador_guarda_cada_imagen_una_vez(datos_empresa, datos_cliente, actividades):
+    repetidas = actividades + actividades
+    borrador = guardar_borrador(datos_empresa, datos_cliente, repetidas)
+
+    nombres = zipfile.ZipFile(io.BytesIO(borrador)).namelist()
+    assert len([n for n in nombres if n.startswith("imagenes/")]) == 6
+
+
+def test_manifiesto_suelto_omite_imagenes(datos_empresa, datos_cliente, actividades):
+    # El manifiesto.json extraído de un borrador referencia imágenes por nombre
+    borrador = guardar_borrador(datos_empresa, datos_cliente, actividades)
+    manifiesto = zipfile.ZipFile(io.BytesIO(borrador)).read("manifiesto.json")
+
+    _, _, leidas = leer_borrador(io.BytesIO(manifiesto))
+
+    assert [a["titulo"] for a in leidas] == [a["titulo"] for a in actividades]
+    assert leidas[0]["imagenes"] == []
+    assert leidas[2]["despues"]["imagenes"] == []
+
+    doc = Document(consolidar([(datos_empresa, datos_cliente, leidas)]))
+    assert resumir_estructura(doc)["imagenes"] == 0
+
+
+@pytest.mark.parametrize(
+    "contenido",
+    [
+        b"no es json",
+        b"[]",
+        b'{"actividades": "texto"}',
+        b'{"actividades": [1, 2]}',
+        b'{"datos_cliente": []}',
+    ],
+)
+def test_manifiesto_invalido(contenido):
+    with pytest.raises(ValueError):
+        leer_borrador(io.BytesIO(contenido))
+
+
+def test_borrador_con_manifiesto_invalido():
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        zf.writestr("manifiesto.json", "[]")
+
+    with pytest.raises(ValueError):
+        leer_borrador(buffer)
+
+
+def test_consolidado_indice_y_visitas(datos_empresa, datos_cliente, actividades):
+    borradores = [
+        guardar_borrador(dict(datos_empresa, fecha=f"0{i} Enero 2026"), datos_cliente, actividades)
+        for i in range(1, 4)
+    ]
+
+    salida = consolidar(leer_borrador(io.BytesIO(b)) for b in borradores)
+    doc = Document(salida)
+
+    tabla_cliente, tabla_indice = doc.tables[:2]
+    assert tabla_cliente.rows[0].cells[1].text == datos_cliente["nombre"]
+    assert [row.cells[1].text for row in tabla_indice.rows[1:]] == [
+        "01 Enero 2026",
+        "02 Enero 2026",
+        "03 Enero 2026",
+    ]
+    assert all(row.cells[4].text == str(len(actividades)) for row in tabla_indice.rows[1:])
+    # Un solo membrete
+    assert len(doc.sections) == 1
+    # 3 visitas x 6 imágenes en el cuerpo, pero una sola parte por imagen (+ logo)
+    assert resumir_estructura(doc)["imagenes"] == 18
+    medios = [n for n in zipfile.ZipFile(salida).namelist() if n.startswith("word/media/")]
+    assert len(medios) == 7
+
+
+def test_consolidado_rechaza_otro_cliente(datos_empresa, datos_cliente, actividades):
+    otro_cliente = dict(datos_cliente, nombre="Otro S.A.", nit="900.123.456-7")
+    borradores = [
+        (datos_empresa, datos_cliente, actividades),
+        (datos_empresa, otro_cliente, actividades),
+    ]
+
+    with pytest.raises(ValueError, match="visita 2"):
+        consolidar(iter(borradores))
+
+
+def test_consolidado_rechaza_imagen_danada(datos_empresa, datos_cliente, actividades):
+    danadas = [dict(actividades[0], imagenes=[b"no es una imagen"])]
+    borradores = [
+        (datos_empresa, datos_cliente, actividades),
+        (datos_empresa, datos_cliente, danadas),
+    ]
+
+    with pytest.raises(ValueError, match="visita 2"):
+        consolidar(iter(borradores))
+
+
+def test_consolidado_mismo_nit_con_otro_formato(datos_empresa, datos_cliente):
+    mismo_cliente = dict(datos_cliente, nit="8913002419")
+
+    consolidar(
+        iter([(datos_empresa, datos_cliente, []), (datos_empresa, mismo_cliente, [])])
+    )
+
+
+def test_consolidado_sin_borradores():
+    with pytest.raises(ValueError):
+        consolidar(iter([]))
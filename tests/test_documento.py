@@ -0,0 +1,88 @@
+import io
+import zipfile
+
+from docx import Document
+from docx.oxml.ns import qn
+
+from generador_informe import crear_documento_tecnico
+from tests.estructura import estructura_esperada, resumir_estructura
+
+
+def test_estructura_coincide_con_actividades(datos_empresa, datos_cliente, actividades):
+    doc = crear_documento_tecnico(datos_empresa, datos_cliente, actividades)
+
+    assert resumir_estructura(doc) == estructura_esperada(actividades)
+
+
+def test_estructura_sin_actividades(datos_empresa, datos_cliente):
+    doc = crear_documento_tecnico(datos_empresa, datos_cliente, [])
+
+    assert resumir_estructura(doc) == {
+        "tablas": 2,
+        "sombreados": 7,
+        "celdas_con_borde": 0,
+        "imagenes": 0,
+    }
+
+
+def test_membrete_con_logo_y_empresa(datos_empresa, datos_cliente):
+    doc = crear_documento_tecnico(datos_empresa, datos_cliente, [])
+
+    header = doc.sections[0].header
+    assert len(header.tables) == 1
+    celda_logo, celda_info = header.tables[0].rows[0].cells
+    assert len(celda_logo._element.xpath(".//pic:pic")) == 1
+    assert celda_info.text.startswith("ROTOMAQUINAS S.A.S")
+
+
+def test_tablas_de_datos(datos_empresa, datos_cliente):
+    doc = crear_documento_tecnico(datos_empresa, datos_cliente, [])
+
+    tabla_general, tabla_cliente = doc.tables
+    assert [row.cells[1].text for row in tabla_general.rows] == [
+        datos_empresa["fecha"],
+        datos_empresa["tecnico"],
+        datos_empresa["ubicacion"],
+        "Servicio de mantenimiento y limpieza",
+    ]
+    assert [row.cells[1].text for row in tabla_cliente.rows] == [
+        datos_cliente["nombre"],
+        datos_cliente["nit"],
+        datos_cliente["direccion"],
+    ]
+    # Etiquetas sombreadas en gris suave
+    for tabla in (tabla_general, tabla_cliente):
+        for row in tabla.rows:
+            shd = row.cells[0]._tc.tcPr.find(qn("w:shd"))
+            assert shd.get(qn("w:fill")) == "F2F2F2"
+
+
+def test_bloques_antes_despues(datos_empresa, datos_cliente, actividades):
+    doc = crear_documento_tecnico(datos_empresa, datos_cliente, actividades)
+
+    titulos = [
+        tabla.rows[0].cells[0]
+        for tabla in doc.tables
+        if tabla.rows[0].cells[0].text in ("ANTES", "DESPUÉS")
+    ]
+    assert [celda.text for celda in titulos] == ["ANTES", "DESPUÉS", "DESPUÉS"]
+    for celda in titulos:
+        tcPr = celda._tc.tcPr
+        assert tcPr.find(qn("w:shd")).get(qn("w:fill")) == "D9D9D9"
+        for borde in ("top", "left", "bottom", "right"):
+            elemento = tcPr.find(qn(f"w:{borde}"))
+            assert elemento.get(qn("w:val")) == "single"
+            assert elemento.get(qn("w:sz")) == "12"
+
+
+def test_documento_guardado_se_puede_abrir(datos_empresa, datos_cliente, actividades):
+    doc = crear_documento_tecnico(datos_empresa, datos_cliente, actividades)
+    salida = io.BytesIO()
+    doc.save(salida)
+
+    reabierto = Document(io.BytesIO(salida.getvalue()))
+    assert resumir_estructura(reabierto) == estructura_esperada(actividades)
+
+    # Logo + 6 imágenes distintas de las actividades
+    nombres = zipfile.ZipFile(salida).namelist()
+    assert len([n for n in nombres if n.startswith("word/media/")]) == 7
@@ -0,0 +1,166 @@
+import io
+import os
+import time
+
+import pytest
+from docx import Document
+from PIL import Image
+
+from generador_informe import add_image_to_cell, optimizar_imagen
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "imagenes")
+
+# imagen: (formato esperado, tiene transparencia)
+ESPERADO = {
+    "foto.png": ("JPEG", False),
+    "foto_rgba.png": ("JPEG", True),
+    "captura.png": ("PNG", False),
+    "foto.jpg": ("JPEG", False),
+    "gris_l.png": ("PNG", False),
+    "gris_la.png": ("PNG", True),
+    "paleta_p.png": ("PNG", False),
+    "paleta_transparente.png": ("PNG", True),
+    "gris_16_bits.png": ("PNG", False),
+}
+
+
+def leer(nombre):
+    with open(os.path.join(CORPUS, nombre), "rb") as f:
+        return f.read()
+
+
+def abrir(datos):
+    return Image.open(io.BytesIO(datos))
+
+
+@pytest.mark.parametrize("nombre", sorted(ESPERADO))
+def test_formato_de_salida(nombre):
+    formato, _ = ESPERADO[nombre]
+
+    salida = optimizar_imagen(leer(nombre))
+
+    img = abrir(salida)
+    assert img.format == formato
+    assert img.mode in ("RGB", "L", "P")
+    assert img.size == abrir(leer(nombre)).size
+
+
+@pytest.mark.parametrize("nombre", sorted(ESPERADO))
+def test_no_crece_salvo_al_aplanar(nombre):
+    _, tiene_alfa = ESPERADO[nombre]
+    entrada = leer(nombre)
+
+    salida = optimizar_imagen(entrada)
+
+    if not tiene_alfa:
+        assert len(salida) <= len(entrada)
+
+
+def test_jpeg_se_conserva():
+    entrada = leer("foto.jpg")
+
+    assert optimizar_imagen(entrada) is entrada
+
+
+@pytest.mark.parametrize(
+    "nombre", ["foto_rgba.png", "gris_la.png", "paleta_transparente.png"]
+)
+def test_transparencia_sobre_blanco(nombre):
+    img = abrir(optimizar_imagen(leer(nombre))).convert("RGB")
+
+    # El cuarto izquierdo de estas imágenes es totalmente transparente; se deja
+    # un margen para los artefactos de JPEG en el borde
+    ancho, alto = img.size
+    muestra = img.crop((0, 0, ancho // 4 - 16, alto)).getextrema()
+    assert all(minimo >= 250 for minimo, _ in muestra)
+
+
+def test_gris_16_bits_conserva_los_niveles():
+    img = abrir(optimizar_imagen(leer("gris_16_bits.png"))).convert("L")
+    referencia = abrir(leer("gris_l.png"))
+
+    ancho, alto = img.size
+    for punto in [(0, 0), (ancho // 2, alto // 2), (ancho - 1, alto - 1)]:
+        assert abs(img.getpixel(punto) - referencia.getpixel(punto)) <= 1
+
+
+def test_gris_16_bits_con_nivel_transparente():
+    # tRNS de 16 bits: 1000 es transparente, 900 no (ambos quedan en 3 en 8 bits)
+    img = Image.new("I;16", (8, 8), 1000)
+    img.putpixel((0, 0), 900)
+    entrada = io.BytesIO()
+    img.save(entrada, format="PNG", transparency=1000)
+
+    salida = abrir(optimizar_imagen(entrada.getvalue())).convert("RGB")
+
+    assert salida.getpixel((4, 4)) == (255, 255, 255)
+    assert salida.getpixel((0, 0)) == (3, 3, 3)
+
+
+def test_bytes_que_no_son_imagen_se_devuelven_igual():
+    assert optimizar_imagen(b"no es una imagen") == b"no es una imagen"
+
+
+def generar_docx(imagenes):
+    """
+    Incrustar las imágenes como lo hace el informe y devolver (bytes, segundos).
+    """
+    inicio = time.perf_counter()
+    doc = Document()
+    celda = doc.add_table(rows=1, cols=1).cell(0, 0)
+    for image_bytes in imagenes:
+        add_image_to_cell(celda, image_bytes, width_inches=2.2)
+    salida = io.BytesIO()
+    doc.save(salida)
+    return salida.tell(), time.perf_counter() - inicio
+
+
+def convertir(imagenes):
+    """
+    Optimizar las imágenes y devolver (imágenes optimizadas, segundos).
+    """
+    inicio = time.perf_counter()
+    optimizadas = [optimizar_imagen(datos) for datos in imagenes]
+    return optimizadas, time.perf_counter() - inicio
+
+
+def mejor_de(repeticiones, funcion, *args):
+    resultados = [funcion(*args) for _ in range(repeticiones)]
+    return resultados[0][0], min(segundos for _, segundos in resultados)
+
+
+def test_ahorro_frente_a_incrustar_sin_convertir(record_property):
+    """
+    Comparar el comportamiento anterior de `add_image_to_cell` (imagen tal
+    cual) con el de optimizar y luego incrustar, sobre todo el corpus.
+
+    Solo se comprueban los tamaños; los tiempos se informan al final de la
+    ejecución de pytest porque dependen de la máquina.
+    """
+    originales = [leer(nombre) for nombre in sorted(ESPERADO)]
+
+    tamano_antes, incrustar_antes = mejor_de(5, generar_docx, originales)
+    optimizadas, conversion = mejor_de(5, convertir, originales)
+    tamano_despues, incrustar_despues = mejor_de(5, generar_docx, optimizadas)
+
+    record_property(
+        "rendimiento",
+        f"corpus de imágenes: {tamano_antes / 1024:.0f} KB -> "
+        f"{tamano_despues / 1024:.0f} KB docx; antes {incrustar_antes * 1000:.1f} ms "
+        f"(incrustar), después {conversion * 1000:.1f} ms (convertir) + "
+        f"{incrustar_despues * 1000:.1f} ms (incrustar) = "
+        f"{(conversion + incrustar_despues) * 1000:.1f} ms",
+    )
+
+    assert tamano_despues <= tamano_antes * 0.5
+
+
+def test_ahorro_en_fotografia_png():
+    original = leer("foto.png")
+    optimizada = optimizar_imagen(original)
+
+    tamano_antes, _ = generar_docx([original])
+    tamano_despues, _ = generar_docx([optimizada])
+
+    assert tamano_despues < tamano_antes
+    assert len(optimizada) <= len(original) * 0.3
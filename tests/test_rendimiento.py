@@ -0,0 +1,89 @@
+"""
+Presupuestos de rendimiento sobre cargas fijas (ver `tests/cargas.py`).
+
+Cada carga se mide en un subproceso para que la memoria máxima (ru_maxrss)
+incluya lo que reservan lxml y Pillow y no dependa de las otras pruebas. Los
+valores medidos se muestran al final de la ejecución de pytest, para que las
+mejoras también se vean.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MB = 1024 * 1024
+
+# carga: (tiempo máximo en s, memoria máxima en MB, tamaño máximo en MB)
+#
+# Unas 1.5 veces lo medido (Linux, Python 3.11): visita_tipica 1.0-1.3 s,
+# 84 MB y 18.9 MB; visita_grande 1.5-1.9 s, 79 MB y 19.4 MB. El tamaño es
+# determinista, así que su margen es menor (5 %). Al mejorar el rendimiento,
+# bajar estos valores.
+PRESUPUESTOS = {
+    "visita_tipica": (2.0, 130, 20),
+    "visita_grande": (2.8, 125, 20.5),
+}
+
+
+# Consolidado: (visitas de la carga pequeña, visitas de la grande, crecimiento
+# máximo de memoria en MB). Medido: 5 -> 40 visitas suben el .docx de 4 a
+# 27 MB y la memoria máxima unos 4 MB (el XML del cuerpo); con las imágenes
+# guardadas en el documento en memoria subía unos 44 MB.
+CONSOLIDADO = (5, 40, 10)
+
+
+def medir(*argumentos):
+    resultado = subprocess.run(
+        [sys.executable, "-m", "tests.cargas", *argumentos],
+        cwd=RAIZ,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(resultado.stdout)
+
+
+@pytest.mark.parametrize("carga", sorted(PRESUPUESTOS))
+def test_presupuestos(carga, record_property):
+    tiempo_max, memoria_max_mb, tamano_max_mb = PRESUPUESTOS[carga]
+
+    metricas = medir(carga)
+
+    record_property(
+        "rendimiento",
+        f"{carga}: {metricas['duracion_s']:.2f} s (máx. {tiempo_max} s), "
+        f"{metricas['memoria_max_bytes'] / MB:.0f} MB RSS (máx. {memoria_max_mb} MB), "
+        f"{metricas['tamano_bytes'] / MB:.1f} MB docx (máx. {tamano_max_mb} MB)",
+    )
+
+    assert metricas["duracion_s"] <= tiempo_max
+    assert metricas["memoria_max_bytes"] <= memoria_max_mb * MB
+    assert metricas["tamano_bytes"] <= tamano_max_mb * MB
+    # El .docx no debe pesar mucho más que las imágenes que contiene
+    assert metricas["tamano_bytes"] <= metricas["imagenes_bytes"] * 1.05 + 0.5 * MB
+
+
+def test_memoria_consolidado_no_crece_con_las_visitas(record_property):
+    pocas, muchas, crecimiento_max_mb = CONSOLIDADO
+
+    chico = medir("consolidado", str(pocas))
+    grande = medir("consolidado", str(muchas))
+    crecimiento = grande["memoria_max_bytes"] - chico["memoria_max_bytes"]
+
+    record_property(
+        "rendimiento",
+        f"consolidado {pocas} -> {muchas} visitas: "
+        f"{chico['tamano_bytes'] / MB:.1f} -> {grande['tamano_bytes'] / MB:.1f} MB docx, "
+        f"{chico['memoria_max_bytes'] / MB:.0f} -> "
+        f"{grande['memoria_max_bytes'] / MB:.0f} MB RSS "
+        f"(crecimiento máx. {crecimiento_max_mb} MB)",
+    )
+
+    # Que la prueba tenga sentido: el documento sí crece
+    assert grande["tamano_bytes"] - chico["tamano_bytes"] > 2 * crecimiento_max_mb * MB
+    assert crecimiento <= crecimiento_max_mb * MB
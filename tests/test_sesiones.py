@@ -0,0 +1,199 @@
+import os
+import stat
+import time
+
+import pytest
+
+import sesiones
+from sesiones import (
+    SESION_ACTIVA,
+    SESION_ERROR_RESTAURANDO,
+    SESION_RENOVAR_SUBIDAS,
+    SESION_RESTAURADA,
+    contar_bytes_imagenes,
+    crear_registro,
+    expulsar_sesiones_inactivas,
+    registrar_sesion,
+)
+from tests.cargas import jpeg_foto
+
+
+@pytest.fixture(autouse=True)
+def dir_sesiones(tmp_path, monkeypatch):
+    directorio = tmp_path / "sesiones"
+    monkeypatch.setattr(sesiones, "DIR_SESIONES", str(directorio))
+    return directorio
+
+
+def envejecer(registro, session_id, minutos=60):
+    registro["sesiones"][session_id]["ultimo_uso"] -= minutos * 60
+
+
+def test_contar_bytes_imagenes(actividades):
+    # Las actividades de prueba llevan las fotos 1 a 6, una vez cada una
+    assert contar_bytes_imagenes(actividades) == sum(
+        len(jpeg_foto(semilla)) for semilla in range(1, 7)
+    )
+
+
+def test_expulsar_y_restaurar(actividades, dir_sesiones):
+    registro = crear_registro()
+    lista = list(actividades)
+    registrar_sesion(registro, "A", lista, bytes_subidas=1000)
+    envejecer(registro, "A")
+
+    assert expulsar_sesiones_inactivas(registro, forzar=True) == 1
+
+    entrada = registro["sesiones"]["A"]
+    assert lista == []
+    assert entrada["bytes"] == entrada["bytes_subidas"] == 0
+    assert entrada["expulsada"]
+    # Carpeta privada y sin temporales a medias
+    assert stat.S_IMODE(os.stat(dir_sesiones).st_mode) == 0o700
+    assert os.listdir(dir_sesiones) == ["A.zip"]
+
+    # Sus subidas se liberaron y no hay nuevas: la app debe renovar los widgets
+    assert registrar_sesion(registro, "A", lista) == SESION_RENOVAR_SUBIDAS
+    assert lista == actividades
+    assert os.listdir(dir_sesiones) == []
+    assert registrar_sesion(registro, "A", lista) == SESION_ACTIVA
+
+
+def test_restaurar_con_subida_nueva(actividades):
+    registro = crear_registro()
+    lista = list(actividades)
+    registrar_sesion(registro, "A", lista, bytes_subidas=1000)
+    envejecer(registro, "A")
+    expulsar_sesiones_inactivas(registro, forzar=True)
+
+    # La ejecución que restaura es la de una subida: sus widgets no se tocan
+    # y la subida se cuenta
+    assert registrar_sesion(registro, "A", lista, bytes_subidas=2000) == SESION_RESTAURADA
+    assert lista == actividades
+    assert registro["sesiones"]["A"]["bytes_subidas"] == 2000
+
+
+def test_restaurar_sin_subidas_previas(actividades):
+    registro = crear_registro()
+    lista = list(actividades)
+    registrar_sesion(registro, "A", lista)
+    envejecer(registro, "A")
+    expulsar_sesiones_inactivas(registro, forzar=True)
+
+    assert registrar_sesion(registro, "A", lista) == SESION_RESTAURADA
+    assert lista == actividades
+
+
+def test_expulsar_solo_subidas(dir_sesiones):
+    registro = crear_registro()
+    registrar_sesion(registro, "A", [], bytes_subidas=5000)
+    envejecer(registro, "A")
+
+    assert expulsar_sesiones_inactivas(registro, forzar=True) == 1
+    assert not os.path.exists(dir_sesiones) or os.listdir(dir_sesiones) == []
+    assert registrar_sesion(registro, "A", []) == SESION_RENOVAR_SUBIDAS
+
+
+def test_no_expulsa_sesion_actual_ni_recientes(actividades):
+    registro = crear_registro()
+    registrar_sesion(registro, "A", list(actividades))
+    registrar_sesion(registro, "B", list(actividades))
+    envejecer(registro, "A")
+
+    assert expulsar_sesiones_inactivas(registro, sesion_actual="A", forzar=True) == 0
+    assert registro["sesiones"]["A"]["actividades"]
+    assert registro["sesiones"]["B"]["actividades"]
+
+
+def test_barrido_limitado_por_intervalo(actividades):
+    registro = crear_registro()
+    expulsar_sesiones_inactivas(registro)
+    registrar_sesion(registro, "A", list(actividades))
+    envejecer(registro, "A")
+
+    assert expulsar_sesiones_inactivas(registro) == 0
+    assert expulsar_sesiones_inactivas(registro, forzar=True) == 1
+
+
+def test_escritura_fuera_del_candado(actividades, monkeypatch):
+    registro = crear_registro()
+    lista = list(actividades)
+    registrar_sesion(registro, "A", lista)
+    envejecer(registro, "A")
+    escribir = sesiones.escribir_borrador_sesion
+
+    def escribir_mientras_vuelve(session_id, actividades):
+        # Otra sesión puede registrarse mientras se escribe el borrador...
+        assert registro["lock"].acquire(blocking=False)
+        registro["lock"].release()
+        # ...y la dueña vuelve a usar la sesión antes de que termine
+        registrar_sesion(registro, session_id, lista)
+        return escribir(session_id, actividades)
+
+    monkeypatch.setattr(sesiones, "escribir_borrador_sesion", escribir_mientras_vuelve)
+
+    assert expulsar_sesiones_inactivas(registro, forzar=True) == 0
+    assert lista == actividades
+    assert not registro["sesiones"]["A"]["expulsada"]
+    assert os.listdir(sesiones.DIR_SESIONES) == []
+
+
+def test_lectura_al_restaurar_fuera_del_candado(actividades, dir_sesiones, monkeypatch):
+    registro = crear_registro()
+    lista = list(actividades)
+    registrar_sesion(registro, "A", lista)
+    envejecer(registro, "A")
+    expulsar_sesiones_inactivas(registro, forzar=True)
+    leer = sesiones.leer_borrador
+
+    def leer_con_barrido(archivo):
+        assert registro["lock"].acquire(blocking=False)
+        registro["lock"].release()
+        # Un barrido durante la lectura no debe borrar el borrador
+        monkeypatch.setattr(sesiones, "HORAS_RETENCION_BORRADORES", 0)
+        expulsar_sesiones_inactivas(registro, forzar=True)
+        assert os.listdir(dir_sesiones) == ["A.zip"]
+        return leer(archivo)
+
+    monkeypatch.setattr(sesiones, "leer_borrador", leer_con_barrido)
+
+    assert registrar_sesion(registro, "A", lista) == SESION_RESTAURADA
+    assert lista == actividades
+    assert not registro["sesiones"]["A"]["expulsada"]
+    assert os.listdir(dir_sesiones) == []
+
+
+def test_error_al_restaurar_conserva_el_borrador(actividades, dir_sesiones):
+    registro = crear_registro()
+    lista = list(actividades)
+    registrar_sesion(registro, "A", lista)
+    envejecer(registro, "A")
+    expulsar_sesiones_inactivas(registro, forzar=True)
+
+    archivo = dir_sesiones / "A.zip"
+    contenido = archivo.read_bytes()
+    archivo.write_bytes(b"corrupto")
+
+    assert registrar_sesion(registro, "A", lista) == SESION_ERROR_RESTAURANDO
+    assert registro["sesiones"]["A"]["archivo"] == str(archivo)
+    assert archivo.exists()
+
+    # Se reintenta en la siguiente ejecución
+    archivo.write_bytes(contenido)
+    assert registrar_sesion(registro, "A", lista) == SESION_RESTAURADA
+    assert lista == actividades
+
+
+def test_retencion_borra_borradores_vencidos(actividades, dir_sesiones, monkeypatch):
+    registro = crear_registro()
+    registrar_sesion(registro, "A", list(actividades))
+    envejecer(registro, "A")
+    expulsar_sesiones_inactivas(registro, forzar=True)
+
+    monkeypatch.setattr(sesiones, "HORAS_RETENCION_BORRADORES", 0)
+    registro["sesiones"]["A"]["ultimo_uso"] = time.time() - 1
+
+    expulsar_sesiones_inactivas(registro, forzar=True)
+
+    assert "A" not in registro["sesiones"]
+    assert os.listdir(dir_sesiones) == []